@@ -0,0 +1,133 @@
+"""
+Import-time report for app startup.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters, parses the
+per-module timings CPython writes to stderr and prints the total plus the slowest
+modules by cumulative time. The file-selection window can only appear once
+ui.app has been imported, so that import is the floor of the cold-start time.
+
+Modules that are deliberately loaded later (plotting, DSP, audio I/O) are
+listed as heavy; the run exits with a non-zero status when any of them is
+imported at startup, so an eager import slipping back in is caught.
+
+No display or audio device is needed. Run from the project root:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --module ui.pages.output_editor --allow-heavy
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Packages that must not be imported before the first window is shown
+HEAVY_PACKAGES = ["matplotlib", "scipy", "numba", "pyfftw", "sounddevice"]
+REPEATS = 5
+TOP_MODULES = 15
+
+
+def parse_importtime(stderr):
+    """
+    Parses -X importtime output.
+
+    Returns:
+        {module: (self_us, cumulative_us)} for every imported module.
+    """
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # Column header
+            continue
+        self_us, cumulative_us, name = fields
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure_import(module, python=sys.executable):
+    """Imports module in a fresh interpreter; returns its parsed timings."""
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        # Run from the project root, whatever the caller's directory
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def heavy_imports(timings, packages=HEAVY_PACKAGES):
+    """Returns the heavy packages whose top-level module was imported."""
+    return [package for package in packages if package in timings]
+
+
+def report(module, repeats=REPEATS, top=TOP_MODULES):
+    """
+    Imports module `repeats` times and keeps the fastest run, which is the one
+    least disturbed by the rest of the machine (the first run also warms the
+    .pyc cache and the OS file cache).
+    """
+    runs = [measure_import(module) for _ in range(repeats)]
+    totals = [run[module][1] for run in runs]
+    best = runs[totals.index(min(totals))]
+
+    slowest = sorted(best.items(), key=lambda item: item[1][1], reverse=True)
+    return {
+        "module": module,
+        "total_ms": min(totals) / 1000,
+        "median_ms": sorted(totals)[len(totals) // 2] / 1000,
+        "modules_imported": len(best),
+        "heavy": heavy_imports(best),
+        "slowest": [
+            {"module": name, "self_ms": own / 1000, "cumulative_ms": cumulative / 1000}
+            for name, (own, cumulative) in slowest[:top]
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report startup import time.")
+    parser.add_argument(
+        "--module", default="ui.app", help="Module to import (default: ui.app)"
+    )
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--top", type=int, default=TOP_MODULES)
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    parser.add_argument(
+        "--allow-heavy",
+        action="store_true",
+        help="Do not fail when plotting/DSP/audio packages are imported",
+    )
+    args = parser.parse_args()
+
+    result = report(args.module, args.repeats, args.top)
+
+    print(
+        f"import {result['module']}: {result['total_ms']:.1f} ms best, "
+        f"{result['median_ms']:.1f} ms median of {args.repeats}, "
+        f"{result['modules_imported']} modules"
+    )
+    print(f"{'cumulative (ms)':>15} {'self (ms)':>10}  module")
+    for entry in result["slowest"]:
+        print(
+            f"{entry['cumulative_ms']:>15.1f} {entry['self_ms']:>10.1f}  "
+            f"{entry['module']}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if result["heavy"]:
+        print(f"Heavy packages imported at startup: {', '.join(result['heavy'])}")
+        if not args.allow_heavy:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
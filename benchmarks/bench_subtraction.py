@@ -0,0 +1,78 @@
+"""
+Benchmarks the in-place gain-mask spectral subtraction in core/kernels.py
+against the previous abs/angle/maximum/exp formula.
+
+Run from the project root:
+    python -m benchmarks.bench_subtraction
+"""
+
+import numpy as np
+from core.audio_utils import manual_stft, hanning_window
+from core.kernels import apply_gain_mask, available_kernels
+from benchmarks.suite import synthetic_signal, pink_noise, measure
+
+SAMPLE_RATE = 44100
+SIGNAL_SECONDS = [30, 300]
+WINDOW_SIZES = [256, 2048]
+PRECISIONS = ["float32", "float64"]
+ALPHA = 1.05
+BETA = 0.001
+
+
+def reference_subtract(stft_matrix, mag_noise, alpha, beta):
+    """Reference copy of the previous formula, kept for comparison."""
+    mag_input = np.abs(stft_matrix)
+    phase_input = np.angle(stft_matrix)
+    mag_denoised = np.maximum(beta * mag_input, mag_input - alpha * mag_noise)
+    return mag_denoised * np.exp(1j * phase_input)
+
+
+def gain_mask_subtract(kernel):
+    def run(stft_matrix, mag_noise, alpha, beta):
+        return apply_gain_mask(stft_matrix.copy(), mag_noise, alpha, beta, kernel)
+
+    return run
+
+
+def main():
+    kernels = available_kernels()
+    # Run each kernel once so numba compilation is not timed
+    for kernel in kernels:
+        apply_gain_mask(np.ones((2, 3), np.complex64), np.ones(3), ALPHA, BETA, kernel)
+
+    print(
+        f"{'seconds':>7} {'M':>5} {'dtype':>8} {'method':>10} "
+        f"{'time (ms)':>10} {'peak (MB)':>10} {'max rel err':>12}"
+    )
+    for seconds in SIGNAL_SECONDS:
+        for M in WINDOW_SIZES:
+            for precision in PRECISIONS:
+                window = hanning_window(M, precision)
+                x = synthetic_signal(seconds, SAMPLE_RATE).astype(window.dtype)
+                _, _, stft = manual_stft(x, SAMPLE_RATE, window, M, M // 2)
+                noise = pink_noise(SAMPLE_RATE, np.random.default_rng(1)) * 0.1
+                _, _, noise_stft = manual_stft(
+                    noise.astype(window.dtype), SAMPLE_RATE, window, M, M // 2
+                )
+                mag_noise = np.mean(np.abs(noise_stft), axis=0, keepdims=True)
+
+                methods = {"reference": reference_subtract}
+                methods.update({k: gain_mask_subtract(k) for k in kernels})
+
+                expected = None
+                for name, func in methods.items():
+                    seconds_taken, peak, result = measure(
+                        func, stft, mag_noise, ALPHA, BETA
+                    )
+                    if expected is None:
+                        expected = result
+                    # Error relative to the largest bin, so silent bins do not dominate
+                    error = np.max(np.abs(result - expected)) / np.max(np.abs(expected))
+                    print(
+                        f"{seconds:>7} {M:>5} {precision:>8} {name:>10} "
+                        f"{seconds_taken * 1000:>10.1f} {peak / 1e6:>10.1f} {error:>12.2e}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Benchmark suite for the STFT -> spectral subtraction -> ISTFT pipeline.
+
+Generates deterministic synthetic signals (tones plus coloured noise), times
+each stage separately and records its peak traced memory. A stage's time is the
+median of REPEATS samples, each lasting at least MIN_SAMPLE_SECONDS. Results are
+written to JSON and can be compared against a stored baseline; the run exits with
+a non-zero status when any stage regresses by more than the tolerance (and, for
+times, by more than MIN_DELTA_SECONDS).
+
+No audio device is needed. Run from the project root:
+    python -m benchmarks.suite --output bench_results.json
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from scipy.io import wavfile
+from core.audio_utils import manual_stft, manual_istft, hanning_window
+from core.fft_backend import describe_backend
+from core.processing import NoiseCanceller, estimate_noise_profile, spectral_subtract
+
+# Long enough that most stages take 50 ms or more per call
+QUICK_CASES = {
+    "seconds": [120, 300],
+    "rates": [16000, 44100],
+    "M": [256, 1024],
+}
+FULL_CASES = {
+    "seconds": [5, 60, 300],
+    "rates": [16000, 44100, 48000],
+    "M": [256, 1024, 4096],
+}
+REPEATS = 7
+# Each timing sample repeats a call until it lasts at least this long
+MIN_SAMPLE_SECONDS = 0.05
+# Time differences below this are noise, whatever the relative change
+MIN_DELTA_SECONDS = 0.005
+ALPHA = 1.05
+BETA = 0.001
+
+
+def synthetic_signal(seconds, rate, seed=0, tones=(220.0, 440.0, 1000.0)):
+    """
+    Returns float32 audio made of a few sine tones plus pink (1/f) noise.
+    The same arguments always give the same samples.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * rate)
+    t = np.arange(n) / rate
+
+    signal = np.zeros(n)
+    for freq in tones:
+        signal += 0.2 * np.sin(2 * np.pi * freq * t)
+
+    return (signal + 0.1 * pink_noise(n, rng)).astype(np.float32)
+
+
+def pink_noise(n, rng):
+    # Shape white noise so its power falls off as 1/f
+    spectrum = np.fft.rfft(rng.standard_normal(n))
+    freqs = np.arange(spectrum.size)
+    freqs[0] = 1
+    noise = np.fft.irfft(spectrum / np.sqrt(freqs), n)
+    return noise / np.max(np.abs(noise))
+
+
+def measure(func, *args):
+    """
+    Returns (median wall time of one call, peak traced bytes of one run, result).
+    The time is the median of REPEATS samples; each sample times enough back-to-back
+    calls to last MIN_SAMPLE_SECONDS, so short stages are not lost in timer noise.
+    """
+    # Warm up (JIT compilation, caches), then size the samples from a second call
+    func(*args)
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    calls = max(1, math.ceil(MIN_SAMPLE_SECONDS / max(elapsed, 1e-9)))
+
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func(*args)
+        samples.append((time.perf_counter() - start) / calls)
+
+    # NumPy reports its array allocations to tracemalloc
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return float(np.median(samples)), peak, result
+
+
+def bench_case(seconds, rate, M, workdir):
+    """Times every stage for one (length, sample rate, M) combination."""
+    R = M // 2
+    window = hanning_window(M)
+    x = synthetic_signal(seconds, rate, seed=1)
+    noise = pink_noise(rate * 2, np.random.default_rng(2)).astype(np.float32) * 0.1
+    mag_noise = estimate_noise_profile(noise, window, M, R)
+
+    stages = {}
+
+    time_s, peak, (_, _, stft) = measure(manual_stft, x, rate, window, M, R)
+    stages["stft"] = {"seconds": time_s, "peak_bytes": peak}
+
+    time_s, peak, denoised = measure(spectral_subtract, stft, mag_noise, ALPHA, BETA)
+    stages["subtraction"] = {"seconds": time_s, "peak_bytes": peak}
+
+    time_s, peak, _ = measure(manual_istft, denoised.T, rate, window, M, R)
+    stages["istft"] = {"seconds": time_s, "peak_bytes": peak}
+
+    # Full pipeline from files, with a fresh canceller each run so nothing is cached
+    input_path = os.path.join(workdir, f"input_{seconds}_{rate}.wav")
+    noise_path = os.path.join(workdir, f"noise_{rate}.wav")
+    if not os.path.exists(input_path):
+        wavfile.write(input_path, rate, np.int16(x * 32767))
+    if not os.path.exists(noise_path):
+        wavfile.write(noise_path, rate, np.int16(noise * 32767))
+
+    def full_process():
+        return NoiseCanceller().process(input_path, noise_path, M, ALPHA, BETA)
+
+    time_s, peak, _ = measure(full_process)
+    stages["process"] = {"seconds": time_s, "peak_bytes": peak}
+
+    return stages
+
+
+def run_suite(cases, log=print):
+    results = {
+        "environment": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            **describe_backend(),
+        },
+        "cases": {},
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for seconds in cases["seconds"]:
+            for rate in cases["rates"]:
+                for M in cases["M"]:
+                    name = f"{seconds}s_{rate}Hz_M{M}"
+                    stages = bench_case(seconds, rate, M, workdir)
+                    results["cases"][name] = stages
+                    log(
+                        f"{name:<22} "
+                        + " ".join(
+                            f"{stage}={value['seconds'] * 1000:8.2f}ms"
+                            for stage, value in stages.items()
+                        )
+                    )
+    return results
+
+
+def compare(results, baseline, tolerance, min_delta=MIN_DELTA_SECONDS):
+    """
+    Returns a list of regression messages. A stage regresses when its time or peak
+    memory exceeds the baseline by more than `tolerance` (0.25 = 25%). A time must
+    also be more than `min_delta` seconds slower.
+    """
+    regressions = []
+    for name, stages in results["cases"].items():
+        base_stages = baseline["cases"].get(name)
+        if base_stages is None:
+            continue
+        for stage, value in stages.items():
+            base = base_stages.get(stage)
+            if base is None:
+                continue
+            for metric in ("seconds", "peak_bytes"):
+                floor = min_delta if metric == "seconds" else 0
+                allowed = max(base[metric] * tolerance, floor)
+                if base[metric] > 0 and value[metric] - base[metric] > allowed:
+                    regressions.append(
+                        f"{name} {stage} {metric}: {value[metric]:.6g} vs baseline "
+                        f"{base[metric]:.6g} (+{value[metric] / base[metric] - 1:.0%})"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the DSP pipeline.")
+    parser.add_argument("--full", action="store_true", help="Run the larger case set")
+    parser.add_argument(
+        "--output", default=None, help="Write results to this JSON file"
+    )
+    parser.add_argument(
+        "--baseline", default=None, help="Compare against this JSON file"
+    )
+    parser.add_argument(
+        "--save-baseline", default=None, help="Write results as a new baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown/memory growth before failing (default 0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=MIN_DELTA_SECONDS * 1000,
+        help="Ignore slowdowns smaller than this many ms (default %(default)g)",
+    )
+    args = parser.parse_args()
+
+    results = run_suite(FULL_CASES if args.full else QUICK_CASES)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(
+            results, baseline, args.tolerance, args.min_delta_ms / 1000
+        )
+        if regressions:
+            print("FAIL: performance regressions found")
+            for message in regressions:
+                print("  " + message)
+            sys.exit(1)
+        print("PASS: no regressions beyond tolerance")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,404 @@
+from functools import lru_cache
+import os
 import numpy as np
+from numpy.lib.stride_tricks import as_strided
 from scipy.io import wavfile
+from .fft_backend import get_backend
 
+# Numeric precision of the DSP path. Every stage follows the dtype of the window it
+# is given: a float32 window gives float32 frames, complex64 spectra and float32
+# output, which halves memory compared to float64/complex128.
+#
+# Error bound for "float32": each value carries a relative rounding error of about
+# 2**-24 (6e-8), and the FFTs add O(log2 M) roundings. Against the float64 path the
+# cleaned output differs by at most ~1e-6 of full scale for M <= 4096 on normalized
+# input, i.e. well below one 16-bit LSB (1 / 32767 = 3.1e-5), so saved files are
+# unaffected. The exception is the first and last few samples, where the window sum
+# approaches zero and the normalization amplifies rounding in either precision.
+# Use "float64" when comparing against reference implementations.
+PRECISIONS = {"float32": np.float32, "float64": np.float64}
+DEFAULT_PRECISION = "float32"
 
-def read_audio(path):
-    # Read the WAV file from the specified path; returns sample rate and raw data
-    rate, data = wavfile.read(path)
 
-    # Check if the audio has more than one channel (e.g., stereo has 2 dimensions)
-    if data.ndim > 1:
-        # Convert stereo to mono by averaging the channels into a single stream
-        data = data.mean(axis=1)
+def precision_dtype(precision):
+    """Returns the real NumPy dtype for a precision name ("float32" or "float64")."""
+    if precision not in PRECISIONS:
+        raise ValueError(
+            f"Unknown precision {precision!r}, expected one of {list(PRECISIONS)}"
+        )
+    return np.dtype(PRECISIONS[precision])
 
-    # Check if the data type is integer (standard WAV is typically int16 or int32)
-    if np.issubdtype(data.dtype, np.integer):
+
+def hanning_window(M, precision=DEFAULT_PRECISION):
+    """np.hanning(M) in the requested precision."""
+    return np.hanning(M).astype(precision_dtype(precision))
+
+
+# WAV format tags
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _to_float32(data, bits=None, mono=True):
+    """
+    Converts a (samples,) or (samples, channels) block of raw WAV samples to float32,
+    either mono (samples,) or one row per channel (channels, samples).
+
+    Integer samples are normalized to -1.0..1.0 before the channels are averaged,
+    and every step writes into a single float32 buffer (no float64 temporaries).
+    24-bit PCM is passed as uint8 with a trailing axis of 3 bytes.
+    """
+    # Treat every block as (samples, channels[, bytes])
+    if data.ndim == 1 or (bits == 24 and data.ndim == 2):
+        data = data[:, None]
+    n_channels = data.shape[1]
+
+    if bits == 24:
+        max_val = 2**23 - 1
+    elif data.dtype == np.uint8:
+        # 8-bit PCM is unsigned, centred on 128
+        max_val = 127
+    elif np.issubdtype(data.dtype, np.integer):
         # specific integer type limits (e.g., 32767 for int16)
         max_val = np.iinfo(data.dtype).max
-        # Normalize the integer data to a floating-point range between -1.0 and 1.0
-        data = data.astype(np.float32) / max_val
+    else:
+        max_val = None
+
+    if mono:
+        out = np.empty(data.shape[0], dtype=np.float32)
+    else:
+        out = np.empty((n_channels, data.shape[0]), dtype=np.float32)
+    for channel in range(n_channels):
+        samples = data[:, channel]
+        if bits == 24:
+            # Assemble the little-endian 3-byte samples into the top of an int32, then
+            # shift back down so the sign bit is extended
+            samples = (
+                (samples[:, 0].astype(np.int32) << 8)
+                | (samples[:, 1].astype(np.int32) << 16)
+                | (samples[:, 2].astype(np.int32) << 24)
+            ) >> 8
+        elif data.dtype == np.uint8:
+            samples = samples.astype(np.int16) - 128
+
+        if not mono:
+            out[channel] = samples
+        elif channel == 0:
+            out[:] = samples
+        else:
+            out += samples
+
+    # Normalize the integer data to a floating-point range between -1.0 and 1.0
+    if max_val is not None:
+        out /= max_val
+
+    # Average the channels into a single stream
+    if mono and n_channels > 1:
+        out /= n_channels
+
+    return out
+
+
+class WavReader:
+    """
+    Memory-mapped reader for PCM (8/16/24/32-bit) and float (32/64-bit) WAV files.
+
+    Opening a file only parses its header; samples are paged in and converted to
+    float32 when read() or blocks() touches them.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(12)
+            if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+                raise ValueError(f"{path} is not a RIFF/WAVE file")
+
+            fmt = None
+            data_offset = data_size = None
+            file_size = os.fstat(f.fileno()).st_size
+
+            # Walk the chunks until both 'fmt ' and 'data' have been found
+            while data_offset is None:
+                chunk_header = f.read(8)
+                if len(chunk_header) < 8:
+                    break
+                chunk_id = chunk_header[:4]
+                chunk_size = int.from_bytes(chunk_header[4:], "little")
+                if chunk_id == b"fmt ":
+                    fmt = f.read(chunk_size)
+                    f.seek(chunk_size % 2, 1)
+                elif chunk_id == b"data":
+                    data_offset = f.tell()
+                    # Streamed WAVs may leave the size unset; trust the file length instead
+                    data_size = min(chunk_size, file_size - data_offset)
+                else:
+                    # Chunks are padded to an even number of bytes
+                    f.seek(chunk_size + chunk_size % 2, 1)
+
+        if fmt is None or data_offset is None:
+            raise ValueError(f"{path} has no fmt or data chunk")
+
+        format_tag = int.from_bytes(fmt[0:2], "little")
+        self.channels = int.from_bytes(fmt[2:4], "little")
+        self.rate = int.from_bytes(fmt[4:8], "little")
+        self.bits = int.from_bytes(fmt[14:16], "little")
+        if format_tag == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+            # The real format is the first two bytes of the sub-format GUID
+            format_tag = int.from_bytes(fmt[24:26], "little")
+
+        if format_tag == _WAVE_FORMAT_PCM and self.bits in (8, 16, 24, 32):
+            dtype = {8: "u1", 16: "<i2", 24: "u1", 32: "<i4"}[self.bits]
+        elif format_tag == _WAVE_FORMAT_IEEE_FLOAT and self.bits in (32, 64):
+            dtype = {32: "<f4", 64: "<f8"}[self.bits]
+        else:
+            raise ValueError(
+                f"Unsupported WAV format (tag {format_tag}, {self.bits} bits)"
+            )
+
+        frame_bytes = self.channels * self.bits // 8
+        self.n_samples = data_size // frame_bytes
+
+        # 24-bit samples are mapped as raw bytes and assembled during conversion
+        shape = (self.n_samples, self.channels)
+        if self.bits == 24:
+            shape += (3,)
+        if self.n_samples > 0:
+            self._data = np.memmap(
+                path, dtype=dtype, mode="r", offset=data_offset, shape=shape
+            )
+        else:
+            self._data = np.zeros(shape, dtype=dtype)
+
+    @property
+    def duration(self):
+        return self.n_samples / self.rate
+
+    def read(self, start=0, stop=None, mono=True):
+        """Returns samples [start, stop) as mono float32, or (channels, samples) if mono is False."""
+        return _to_float32(self._data[start:stop], self.bits, mono)
+
+    def blocks(self, block_size, start=0, stop=None):
+        """Yields mono float32 blocks of at most block_size samples."""
+        stop = self.n_samples if stop is None else min(stop, self.n_samples)
+        for block_start in range(start, stop, block_size):
+            yield self.read(block_start, min(block_start + block_size, stop))
+
+
+def read_audio(path, mono=True):
+    # Read the WAV file from the specified path; returns sample rate and
+    # float32 data normalized to -1.0..1.0, either mono or (channels, samples)
+    try:
+        reader = WavReader(path)
+    except ValueError:
+        # Formats the memory-mapped reader does not understand go through scipy
+        rate, data = wavfile.read(path)
+        return rate, _to_float32(data, mono=mono)
+
+    return reader.rate, reader.read(mono=mono)
+
+
+def read_audio_blocks(path, block_size):
+    """
+    Opens a WAV file for block-wise reading.
+
+    Returns the sample rate and a generator of mono float32 blocks of at most
+    block_size samples. The samples are the same as read_audio would return,
+    but only one block is converted at a time.
+    """
+    try:
+        reader = WavReader(path)
+    except ValueError:
+        rate, data = wavfile.read(path, mmap=True)
+        blocks = (
+            _to_float32(data[start : start + block_size])
+            for start in range(0, data.shape[0], block_size)
+        )
+        return rate, blocks
+
+    return reader.rate, reader.blocks(block_size)
+
+
+# Sample formats the writers support: name -> (bytes per sample, full-scale value)
+# Float samples are written as they are, so they keep values outside -1.0..1.0.
+SAMPLE_FORMATS = {
+    "int16": (2, 32767),
+    "int24": (3, 2**23 - 1),
+    "float32": (4, None),
+}
+
+# Samples per channel converted at a time when writing
+WRITE_BLOCK_SIZE = 1 << 16
+
+
+def save_audio(path, rate, data, sample_format="int16", progress=None):
+    """
+    Writes float audio (-1.0 to 1.0) to a WAV file.
+
+    Args:
+        path: Output path.
+        rate: Sample rate.
+        data: Mono (samples,) or multichannel (channels, samples) float array.
+        sample_format: "int16", "int24" (24-bit PCM) or "float32", see SAMPLE_FORMATS.
+        progress: Optional function called with the fraction written (0..1) after
+            every block, e.g. to update a progress bar.
+    """
+    channels = 1 if data.ndim == 1 else data.shape[0]
+    n_samples = data.shape[-1]
+
+    # Converted and written one block at a time, so no full-size integer copy is made
+    with WavBlockWriter(path, rate, sample_format, channels) as writer:
+        for start in range(0, n_samples, WRITE_BLOCK_SIZE):
+            writer.write(data[..., start : start + WRITE_BLOCK_SIZE])
+            if progress is not None:
+                progress(min(start + WRITE_BLOCK_SIZE, n_samples) / n_samples)
+
+    if progress is not None and n_samples == 0:
+        progress(1.0)
+
+
+class WavBlockWriter:
+    """
+    Writes a WAV file one block at a time. Use as a context manager so the header
+    is finalized.
+
+    Integer formats scale -1.0..1.0 to full scale and clip like save_audio always
+    has, so "int16" output is unchanged. Blocks are converted in pieces of
+    WRITE_BLOCK_SIZE samples through one reused buffer, so memory does not grow
+    with the size of a block.
+
+    :param sample_format: "int16", "int24" or "float32", see SAMPLE_FORMATS.
+    :param channels: Number of channels; blocks are then (channels, samples) arrays.
+    """
+
+    def __init__(self, path, rate, sample_format="int16", channels=1):
+        if sample_format not in SAMPLE_FORMATS:
+            raise ValueError(
+                f"Unknown sample format {sample_format!r}, "
+                f"expected one of {list(SAMPLE_FORMATS)}"
+            )
+        self.rate = rate
+        self.sample_format = sample_format
+        self.channels = channels
+        self.sample_width, self._full_scale = SAMPLE_FORMATS[sample_format]
+        self.samples_written = 0
+        self._scratch = None
 
-    return rate, data
+        self._file = open(path, "wb")
+        try:
+            # Sizes are unknown until close(), so write placeholders and patch them later
+            self._file.write(self._header(0))
+        except Exception:
+            self._file.close()
+            raise
 
+    def _header(self, n_samples):
+        frame_bytes = self.channels * self.sample_width
+        data_bytes = n_samples * frame_bytes
+        is_float = self.sample_format == "float32"
 
-def save_audio(path, rate, data):
-    # Scale float data (-1.0 to 1.0) back to 16-bit integer range (-32767 to 32767)
-    # np.clip ensures no values exceed the limits, preventing overflow distortion
-    data_scaled = np.int16(np.clip(data * 32767, -32767, 32767))
+        # 'fmt ' chunk: format tag, channels, rate, byte rate, block align, bits
+        fmt = (
+            (_WAVE_FORMAT_IEEE_FLOAT if is_float else _WAVE_FORMAT_PCM).to_bytes(
+                2, "little"
+            )
+            + self.channels.to_bytes(2, "little")
+            + self.rate.to_bytes(4, "little")
+            + (self.rate * frame_bytes).to_bytes(4, "little")
+            + frame_bytes.to_bytes(2, "little")
+            + (self.sample_width * 8).to_bytes(2, "little")
+        )
+        chunks = b"fmt " + len(fmt).to_bytes(4, "little") + fmt
+        if is_float:
+            # Non-PCM files carry a 'fact' chunk with the number of sample frames
+            chunks += (
+                b"fact" + (4).to_bytes(4, "little") + n_samples.to_bytes(4, "little")
+            )
+        chunks += b"data" + data_bytes.to_bytes(4, "little")
 
-    # Write the scaled integer data to a WAV file at the specified path
-    wavfile.write(path, rate, data_scaled)
+        # The data chunk is padded to an even size on close()
+        riff_size = 4 + len(chunks) + data_bytes + data_bytes % 2
+        return b"RIFF" + riff_size.to_bytes(4, "little") + b"WAVE" + chunks
+
+    def _convert(self, block):
+        # block is (samples, channels); returns its little-endian bytes in the file format
+        # Work in the precision of the data (at least float32) so int16 output matches
+        # the previous full-array conversion exactly
+        n = block.shape[0]
+        dtype = np.result_type(block.dtype, np.float32)
+        if (
+            self._scratch is None
+            or self._scratch.shape[0] < n
+            or self._scratch.dtype != dtype
+        ):
+            self._scratch = np.empty((n, self.channels), dtype=dtype)
+        scratch = self._scratch[:n]
+
+        if self._full_scale is None:
+            scratch[:] = block
+            return scratch.astype("<f4", copy=False).tobytes()
+
+        # Scale float data (-1.0 to 1.0) to the integer range; np.clip prevents
+        # overflow distortion
+        np.multiply(block, self._full_scale, out=scratch)
+        np.clip(scratch, -self._full_scale, self._full_scale, out=scratch)
+        if self.sample_width == 2:
+            return scratch.astype("<i2").tobytes()
+
+        # 24-bit: keep the low three bytes of each little-endian int32
+        samples = scratch.astype("<i4")
+        return samples.view(np.uint8).reshape(n, self.channels, 4)[..., :3].tobytes()
+
+    def write(self, data):
+        """Appends a mono (samples,) or (channels, samples) block of float samples."""
+        data = np.asarray(data)
+        if data.ndim == 1:
+            data = data[np.newaxis]
+        if data.shape[0] != self.channels:
+            raise ValueError(
+                f"Expected {self.channels} channel(s), got a block of shape {data.shape}"
+            )
+
+        # WAV interleaves the channels, i.e. stores (samples, channels)
+        for start in range(0, data.shape[1], WRITE_BLOCK_SIZE):
+            self._file.write(self._convert(data[:, start : start + WRITE_BLOCK_SIZE].T))
+        self.samples_written += data.shape[1]
+
+    def close(self):
+        if self._file.closed:
+            return
+        data_bytes = self.samples_written * self.channels * self.sample_width
+        if data_bytes % 2:
+            self._file.write(b"\0")
+        self._file.seek(0)
+        self._file.write(self._header(self.samples_written))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# Builds a read-only 2D view of overlapping frames without copying the signal
+def frame_signal(x, nperseg, step):
+    # Calculate total number of time frames that fit in the signal
+    # (a signal shorter than one window simply has no frames)
+    n_frames = max((x.shape[-1] - nperseg) // step + 1, 0)
+
+    # Each row starts 'step' samples after the previous one, so the row stride is
+    # step * itemsize while the column stride stays the element size.
+    # as_strided only rewrites the array header; no samples are copied.
+    # Leading axes (e.g. channels) are kept, giving (..., n_frames, nperseg).
+    sample_stride = x.strides[-1]
+    return as_strided(
+        x,
+        shape=x.shape[:-1] + (n_frames, nperseg),
+        strides=x.strides[:-1] + (step * sample_stride, sample_stride),
+        writeable=False,
+    )
 
 
 # Manually performs an Short-Time Fourier Transform (STFT)
@@ -35,29 +406,21 @@ def manual_stft(x, fs, window, nperseg, noverlap):
     # Calculate the step size (hop size) between consecutive windows
     step = nperseg - noverlap
 
-    # Calculate total number of time frames that fit in the signal
-    n_frames = (x.size - nperseg) // step + 1
-
-    windowed_segments_list = []
-    # Loop through each frame index
-    for i in range(n_frames):
-        # Determine start and end indices for the current segment
-        start = i * step
-        end = start + nperseg
+    # View the signal as (n_frames, nperseg) without building a list of segments
+    frames = frame_signal(np.ascontiguousarray(x), nperseg, step)
 
-        # Extract the segment and multiply by the window function (e.g., Hanning)
-        # This tapers the edges to reduce spectral leakage
-        segment = x[start:end] * window
-        windowed_segments_list.append(segment)
-
-    # Convert list of segments into a 2D numpy array
-    windowed_segments = np.array(windowed_segments_list)
+    # Multiply every frame by the window function (e.g., Hanning) in a single batched
+    # operation. This tapers the edges to reduce spectral leakage and is the only
+    # full-size copy made before the FFT.
+    windowed_segments = frames * window
 
     # Perform Real FFT on each segment (row) to get frequency domain representation
-    stft_matrix = np.fft.rfft(windowed_segments, axis=1)
+    # (scipy/numpy/pyFFTW, see core/fft_backend.py). A (channels, samples) input gives
+    # a (channels, n_frames, n_freq_bins) STFT from the same single call.
+    stft_matrix = get_backend().rfft(windowed_segments, axis=-1)
 
     # Calculate time stamps for the center of each frame
-    times = (np.arange(0, stft_matrix.shape[0]) * step + nperseg / 2) / fs
+    times = (np.arange(0, stft_matrix.shape[-2]) * step + nperseg / 2) / fs
 
     # Calculate the specific frequency bins corresponding to the FFT result
     frequencies = np.fft.rfftfreq(nperseg, d=1 / fs)
@@ -65,45 +428,160 @@ def manual_stft(x, fs, window, nperseg, noverlap):
     return frequencies, times, stft_matrix
 
 
-# Manually Performs an Inverse STFT (ISTFT)
-def manual_istft(stft_matrix_t, fs, window, nperseg, noverlap):
-    # Transpose input to ensure shape is (n_frames, n_freq_bins)
-    stft_matrix = stft_matrix_t.T
+# Adds overlapping frames of shape (..., n_frames, nperseg) into one signal per leading index
+def overlap_add(frames, step):
+    *leading, n_frames, nperseg = frames.shape
+    leading = tuple(leading)
+    total_length = (n_frames - 1) * step + nperseg
+    output_signal = np.zeros(leading + (total_length,), dtype=frames.dtype)
 
-    n_frames = stft_matrix.shape[0]
-    # Calculate step size based on overlap
-    step = nperseg - noverlap
+    if n_frames == 0:
+        return output_signal
 
-    # Calculate the total length of the reconstructed time-domain signal
-    total_length = (n_frames - 1) * step + nperseg
+    if nperseg % step == 0:
+        # Fast path (e.g. 50% overlap): split every frame into nperseg // step hop-sized
+        # pieces. Piece j of frame i always lands at (i + j) * step, so all pieces with
+        # the same j can be added in one vectorized slice of the output.
+        # The output slice is viewed as (..., n_frames, step) so the pieces are added in
+        # place without copying them into a flat temporary first.
+        pieces = frames.reshape(leading + (n_frames, nperseg // step, step))
+        sample_stride = output_signal.strides[-1]
+        for j in range(nperseg // step):
+            target = as_strided(
+                output_signal[..., j * step :],
+                shape=leading + (n_frames, step),
+                strides=output_signal.strides[:-1]
+                + (step * sample_stride, sample_stride),
+            )
+            target += pieces[..., j, :]
+    else:
+        # General case: scatter-add every sample to its absolute output index
+        indices = np.arange(n_frames)[:, None] * step + np.arange(nperseg)
+        if leading:
+            rows = np.arange(int(np.prod(leading)))[:, None, None]
+            np.add.at(
+                output_signal.reshape(-1, total_length),
+                (rows, indices),
+                frames.reshape((-1, n_frames, nperseg)),
+            )
+        else:
+            np.add.at(output_signal, indices, frames)
 
-    # Initialize array for the final output signal
-    output_signal = np.zeros(total_length)
-    # Initialize array to track the sum of window weights (for normalization)
-    window_sum = np.zeros(total_length)
+    return output_signal
 
-    # First pass: Calculate the sum of squared windows
-    # This creates a normalization vector to correct amplitude changes caused by overlapping windows
-    for i in range(n_frames):
-        start = i * step
-        end = start + nperseg
-        window_sum[start:end] += window**2
 
+def _inverse(window_sum):
     # Avoid division by zero errors by setting empty spots to a tiny number
     window_sum[window_sum == 0] = 1e-6
+    # Store the reciprocal so normalizing is a multiply
+    return 1.0 / window_sum
 
-    # Second pass: Reconstruct the signal using Overlap-Add method
-    for i in range(n_frames):
-        start = i * step
-        end = start + nperseg
 
-        # Perform Inverse Real FFT to get back to time domain for this frame
-        time_frame = np.fft.irfft(stft_matrix[i, :])
+@lru_cache(maxsize=8)
+def _inverse_window_pieces(window_bytes, dtype, step):
+    # Rebuild the window from its bytes (arrays are not hashable, bytes are)
+    window = np.frombuffer(window_bytes, dtype=dtype)
+    nperseg = window.size
+
+    # Sum of squared windows of a short overlap-add whose middle is covered by every
+    # frame it can be. Away from the first and last nperseg samples the sum of any
+    # longer overlap-add repeats this middle with period `step`, and its edges are
+    # these same ramps, added in the same order.
+    n_frames = -(-nperseg // step) + 2
+    window_sum = _inverse(
+        overlap_add(np.broadcast_to(window**2, (n_frames, nperseg)), step)
+    )
+    head = window_sum[:nperseg]
+    period = window_sum[nperseg : nperseg + step]
+    tail = window_sum[-nperseg:]
+
+    # Freeze them since they are shared
+    for piece in (head, period, tail):
+        piece.flags.writeable = False
+    return head, period, tail
+
+
+def normalize_overlap_add(signal, window, step):
+    """
+    Divides an overlap-added signal by the sum of squared windows, in place.
+
+    The normalization is applied as a cached head ramp, one repeating period and a
+    tail ramp per (window, hop), so no vector as long as the signal is kept.
+
+    :param signal: Output of overlap_add(), shape (..., total_length).
+    :return: signal, normalized.
+    """
+    window = np.ascontiguousarray(window)
+    nperseg = window.size
+    total_length = signal.shape[-1]
+    n_frames = (total_length - nperseg) // step + 1
+
+    if total_length < 2 * nperseg:
+        # Too short for the two ramps to be separate, so compute it directly
+        signal *= _inverse(
+            overlap_add(np.broadcast_to(window**2, (n_frames, nperseg)), step)
+        )
+        return signal
+
+    head, period, tail = _inverse_window_pieces(
+        window.tobytes(), window.dtype.str, step
+    )
+    signal[..., :nperseg] *= head
+    signal[..., total_length - nperseg :] *= tail
+
+    # The middle repeats the period: view its whole periods as (..., periods, step)
+    middle = signal[..., nperseg : total_length - nperseg]
+    periods, remainder = divmod(middle.shape[-1], step)
+    as_strided(
+        middle,
+        shape=middle.shape[:-1] + (periods, step),
+        strides=middle.strides[:-1] + (middle.strides[-1] * step, middle.strides[-1]),
+        writeable=True,
+    )[...] *= period
+    middle[..., periods * step :] *= period[:remainder]
+    return signal
+
+
+def inverse_window_sum(window, step, n_frames):
+    """
+    Returns 1 / sum(window**2) for an overlap-add of n_frames frames.
+    Built from the same cached pieces as normalize_overlap_add().
+    """
+    window = np.asarray(window)
+    total_length = (n_frames - 1) * step + window.size
+    return normalize_overlap_add(
+        np.ones(total_length, dtype=window.dtype), window, step
+    )
+
+
+# Converts STFT frames of shape (..., n_frames, n_freq_bins) into windowed time frames
+def synthesize_frames(stft_matrix, window, nperseg):
+    # Perform Inverse Real FFT on every frame at once to get back to the time domain
+    time_frames = get_backend().irfft(stft_matrix, n=nperseg, axis=-1)
+
+    # Apply the window function again (synthesis window), in place on the batch
+    time_frames *= window
+
+    return time_frames
+
+
+# Manually Performs an Inverse STFT (ISTFT)
+def manual_istft(stft_matrix_t, fs, window, nperseg, noverlap):
+    # Transpose input to ensure shape is (n_frames, n_freq_bins), or
+    # (channels, n_frames, n_freq_bins) for a (channels, n_freq_bins, n_frames) input
+    stft_matrix = np.swapaxes(stft_matrix_t, -1, -2)
+
+    # Calculate step size based on overlap
+    step = nperseg - noverlap
+
+    # Turn every frame back into a windowed time-domain segment
+    time_frames = synthesize_frames(stft_matrix, window, nperseg)
 
-        # Apply the window function again (synthesis window)
-        windowed_frame = time_frame * window
+    # Reconstruct the signal using the Overlap-Add method
+    output_signal = overlap_add(time_frames, step)
 
-        # Add the frame to the output buffer, dividing by the window sum to normalize amplitude
-        output_signal[start:end] += windowed_frame / window_sum[start:end]
+    # Normalize by the sum of squared windows to correct amplitude changes caused by
+    # overlapping windows. The normalization is cached per window/hop.
+    normalize_overlap_add(output_signal, window, step)
 
     return output_signal
@@ -0,0 +1,303 @@
+"""
+Headless batch noise cancelling.
+
+Cleans every WAV file in a directory (or listed in a manifest file) with one
+noise profile, spreading the files over a pool of worker processes. Finished
+files are recorded in a manifest in the output directory, so re-running the same
+command after an interruption skips them.
+
+Run from the project root:
+    python -m core.batch INPUTS NOISE.wav OUTPUT_DIR [--M 256] [--alpha 1.05] [--beta 0.001] [--workers N] [--format int16]
+
+INPUTS is either a directory of .wav files or a text file with one path per line.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .audio_utils import read_audio_blocks, WavBlockWriter, SAMPLE_FORMATS
+from .noise_cache import NoiseProfileCache
+from .parallel import limit_worker_threads
+from .processing import NoiseCanceller
+
+MANIFEST_NAME = "batch_manifest.jsonl"
+BLOCK_SIZE = 1 << 16
+
+# One NoiseCanceller per worker process, so the noise profile is analysed once per worker
+_worker_canceller = None
+
+
+def _init_worker(cache_dir, threads):
+    global _worker_canceller
+    # Share the cores between the workers rather than giving each one a thread per
+    # CPU for the FFT and the numba kernel
+    limit_worker_threads(threads)
+    _worker_canceller = NoiseCanceller(NoiseProfileCache(cache_dir=cache_dir))
+
+
+def _clean_file(input_path, noise_path, output_path, M, alpha, beta, sample_format):
+    # Stream the file through the canceller so memory stays bounded for long recordings
+    rate, blocks = read_audio_blocks(input_path, BLOCK_SIZE)
+
+    # Write to a temporary name first so an interrupted run never leaves a
+    # truncated file that looks finished
+    partial_path = output_path + ".partial"
+    with WavBlockWriter(partial_path, rate, sample_format) as writer:
+        _worker_canceller.process_stream(
+            blocks, writer.write, noise_path, M, alpha, beta
+        )
+    os.replace(partial_path, output_path)
+
+    return writer.samples_written / rate
+
+
+def collect_inputs(inputs):
+    """Returns the list of input WAV paths from a directory or a manifest file."""
+    if os.path.isdir(inputs):
+        return sorted(
+            os.path.join(inputs, name)
+            for name in os.listdir(inputs)
+            if name.lower().endswith(".wav")
+        )
+
+    # Manifest: one path per line, relative paths are relative to the manifest
+    base = os.path.dirname(os.path.abspath(inputs))
+    paths = []
+    with open(inputs) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                paths.append(os.path.join(base, line))
+    return paths
+
+
+def output_names(input_paths):
+    """
+    Returns {absolute input path: output file name}, with no name used twice.
+
+    Files are named cleaned_<file name>. Inputs that share a file name (e.g. from two
+    directories of a manifest) keep their path relative to the inputs' common
+    directory instead, with separators replaced by "_". Raises ValueError if two
+    inputs would still write the same file.
+    """
+    paths = list(dict.fromkeys(os.path.abspath(path) for path in input_paths))
+    counts = {}
+    for path in paths:
+        name = os.path.basename(path)
+        counts[name] = counts.get(name, 0) + 1
+
+    common = os.path.commonpath(paths) if len(paths) > 1 else ""
+    names = {}
+    owners = {}
+    for path in paths:
+        name = os.path.basename(path)
+        if counts[name] > 1:
+            name = os.path.relpath(path, common).replace(os.sep, "_")
+        name = f"cleaned_{name}"
+        other = owners.setdefault(name, path)
+        if other != path:
+            raise ValueError(f"{other} and {path} would both be saved as {name}")
+        names[path] = name
+    return names
+
+
+def load_completed(manifest_path):
+    """
+    Returns {absolute output path: entry} for files finished in earlier runs.
+
+    Output names do not depend on the parameters, so a later run with other
+    parameters overwrites the same file. Only the last entry written for each output
+    describes what the file holds now, so later entries replace earlier ones.
+    """
+    completed = {}
+    if not os.path.exists(manifest_path):
+        return completed
+
+    with open(manifest_path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write can leave a partial last line
+                continue
+            completed[os.path.abspath(entry["output"])] = entry
+    return completed
+
+
+def run_batch(
+    input_paths,
+    noise_path,
+    output_dir,
+    M,
+    alpha,
+    beta,
+    workers=None,
+    cache_dir=None,
+    log=print,
+    sample_format="int16",
+):
+    """
+    Cleans input_paths into output_dir using a process pool.
+
+    Args:
+        input_paths: List of WAV files to clean.
+        noise_path: Path to the noise profile file.
+        output_dir: Directory for the cleaned files and the resume manifest.
+        M, alpha, beta: Same as NoiseCanceller.process().
+        workers: Number of worker processes (defaults to the CPU count).
+        cache_dir: Optional directory for the on-disk noise profile cache.
+        log: Function used to report progress.
+        sample_format: Sample format of the cleaned files, see SAMPLE_FORMATS.
+
+    Returns:
+        A dictionary with counts, wall time and throughput figures.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    parameters = {
+        "noise": os.path.abspath(noise_path),
+        "M": M,
+        "alpha": alpha,
+        "beta": beta,
+        "format": sample_format,
+    }
+
+    # 1. Skip files whose output was last written from the same input with the same
+    # parameters
+    # Checked before anything is processed, so two inputs never write the same file
+    names = output_names(input_paths)
+    completed = load_completed(manifest_path)
+    pending = []
+    skipped = 0
+    for path, name in names.items():
+        output_path = os.path.join(output_dir, name)
+        entry = completed.get(os.path.abspath(output_path))
+        if (
+            entry
+            and entry["input"] == path
+            and entry["parameters"] == parameters
+            and os.path.exists(output_path)
+        ):
+            skipped += 1
+        else:
+            pending.append((path, output_path))
+
+    log(f"{len(pending)} file(s) to process, {skipped} already done")
+
+    # 2. Process the rest in parallel, recording each file as soon as it is done
+    n_cpus = os.cpu_count() or 1
+    workers = workers or n_cpus
+    threads = max(1, n_cpus // workers)
+
+    start = time.perf_counter()
+    done = failed = 0
+    audio_seconds = 0.0
+    with open(manifest_path, "a") as manifest, ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(cache_dir, threads)
+    ) as pool:
+        futures = {
+            pool.submit(
+                _clean_file,
+                path,
+                noise_path,
+                output_path,
+                M,
+                alpha,
+                beta,
+                sample_format,
+            ): (
+                path,
+                output_path,
+            )
+            for path, output_path in pending
+        }
+        for future in as_completed(futures):
+            path, output_path = futures[future]
+            try:
+                seconds = future.result()
+            except Exception as e:
+                failed += 1
+                log(f"FAILED {path}: {e}")
+                continue
+
+            done += 1
+            audio_seconds += seconds
+            manifest.write(
+                json.dumps(
+                    {
+                        "input": path,
+                        "output": output_path,
+                        "parameters": parameters,
+                        "audio_seconds": seconds,
+                    }
+                )
+                + "\n"
+            )
+            manifest.flush()
+            log(f"[{done + failed}/{len(pending)}] {os.path.basename(path)}")
+
+    wall_time = time.perf_counter() - start
+
+    # 3. Throughput summary
+    return {
+        "processed": done,
+        "skipped": skipped,
+        "failed": failed,
+        "wall_time": wall_time,
+        "audio_seconds": audio_seconds,
+        "files_per_second": done / wall_time if wall_time > 0 else 0.0,
+        "realtime_factor": audio_seconds / wall_time if wall_time > 0 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Batch noise cancelling without the user interface."
+    )
+    parser.add_argument("inputs", help="Directory of .wav files or a manifest file")
+    parser.add_argument("noise_path", help="WAV file containing a sample of the noise")
+    parser.add_argument("output_dir", help="Directory for the cleaned files")
+    parser.add_argument("--M", type=int, default=256, help="Window size (FFT size)")
+    parser.add_argument(
+        "--alpha", type=float, default=1.05, help="Over-subtraction factor"
+    )
+    parser.add_argument("--beta", type=float, default=0.001, help="Spectral floor")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--cache-dir", default=None, help="Directory for cached noise profiles"
+    )
+    parser.add_argument(
+        "--format",
+        choices=list(SAMPLE_FORMATS),
+        default="int16",
+        help="Sample format of the cleaned files",
+    )
+    args = parser.parse_args()
+
+    summary = run_batch(
+        collect_inputs(args.inputs),
+        args.noise_path,
+        args.output_dir,
+        args.M,
+        args.alpha,
+        args.beta,
+        workers=args.workers,
+        cache_dir=args.cache_dir,
+        sample_format=args.format,
+    )
+
+    print(
+        f"Processed {summary['processed']} file(s) "
+        f"({summary['skipped']} skipped, {summary['failed']} failed) "
+        f"in {summary['wall_time']:.2f} s"
+    )
+    print(f"{summary['files_per_second']:.2f} files/s")
+    print(f"{summary['realtime_factor']:.1f} audio-seconds per wall-second")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Display spectrograms for the UI.
+
+The plot only ever shows one time frame at a time, so instead of converting the
+whole STFT to dB up front, DisplaySpectrogram converts columns when they are
+asked for and keeps the most recent ones in a small LRU cache. Optionally the
+whole spectrogram can be stored quantized to the fixed -80..20 dB range of the
+plot (uint8 or float16), which is far smaller than a float dB matrix.
+"""
+
+from collections import OrderedDict
+import numpy as np
+
+# Range of the y-axis in SpectrumPlot
+DB_MIN = -80.0
+DB_MAX = 20.0
+
+# Frames converted per step when building a quantized spectrogram
+_QUANTIZE_TILE_FRAMES = 1024
+
+
+class DisplaySpectrogram:
+    """
+    Lazily converted dB spectrogram with shape (bins, frames).
+
+    :param stft: (frames, bins) complex STFT or magnitudes. Not copied.
+    :param norm_factor: Magnitudes are divided by this before the dB conversion.
+    :param gain: Optional function applied in place to a (n, bins) copy of frames before
+        conversion, e.g. spectral subtraction, so a cleaned spectrogram can be derived
+        from the input STFT without storing a second matrix.
+    :param quantize: None, "uint8" or "float16" to precompute and store levels clipped
+        to DB_MIN..DB_MAX instead of converting on demand.
+    :param max_cached_columns: Number of converted columns kept in the LRU cache.
+    """
+
+    def __init__(
+        self, stft, norm_factor, gain=None, quantize=None, max_cached_columns=512
+    ):
+        self._stft = stft
+        self._norm_factor = norm_factor
+        self._gain = gain
+        self.max_cached_columns = max_cached_columns
+        self._columns = OrderedDict()
+
+        self.quantize = quantize
+        self._levels = None
+        if quantize is not None:
+            self._levels = self._quantize_all(quantize)
+            # Everything needed is in the levels now
+            self._stft = None
+
+    @property
+    def shape(self):
+        source = self._levels if self._levels is not None else self._stft
+        frames, bins = source.shape
+        return bins, frames
+
+    def _to_db(self, frames):
+        # 20 * log10(|Mag|) is the standard formula for amplitude to dB
+        # 1e-9 is added to prevent log(0) errors
+        if self._gain is not None:
+            frames = np.array(frames, order="C")
+            self._gain(frames)
+        return 20 * np.log10(np.abs(frames) / self._norm_factor + 1e-9)
+
+    def _quantize_all(self, quantize):
+        n_frames, n_bins = self._stft.shape
+        if quantize == "uint8":
+            levels = np.empty((n_frames, n_bins), dtype=np.uint8)
+        elif quantize == "float16":
+            levels = np.empty((n_frames, n_bins), dtype=np.float16)
+        else:
+            raise ValueError(f"Unknown quantization {quantize!r}")
+
+        # Convert in tiles so no full-size float temporaries are created
+        for start in range(0, n_frames, _QUANTIZE_TILE_FRAMES):
+            db = self._to_db(self._stft[start : start + _QUANTIZE_TILE_FRAMES])
+            np.clip(db, DB_MIN, DB_MAX, out=db)
+            if quantize == "uint8":
+                # 256 evenly spaced levels over the plot range (~0.4 dB steps)
+                db -= DB_MIN
+                db *= 255 / (DB_MAX - DB_MIN)
+                np.rint(db, out=db)
+            levels[start : start + len(db)] = db
+        return levels
+
+    def column(self, index):
+        """Returns the dB values of one time frame as a float32 array of length bins."""
+        if index < 0:
+            index += self.shape[1]
+        if index in self._columns:
+            self._columns.move_to_end(index)
+            return self._columns[index]
+
+        if self._levels is None:
+            values = self._to_db(self._stft[index : index + 1])[0]
+        elif self.quantize == "uint8":
+            values = self._levels[index] * ((DB_MAX - DB_MIN) / 255) + DB_MIN
+        else:
+            values = self._levels[index]
+        values = values.astype(np.float32)
+
+        self._columns[index] = values
+        if len(self._columns) > self.max_cached_columns:
+            self._columns.popitem(last=False)
+        return values
+
+    def __getitem__(self, key):
+        # Supports the [:, index] column access used by the plot
+        if (
+            isinstance(key, tuple)
+            and len(key) == 2
+            and key[0] == slice(None)
+            and isinstance(key[1], (int, np.integer))
+        ):
+            return self.column(int(key[1]))
+        raise TypeError("DisplaySpectrogram only supports [:, index] column access")
@@ -0,0 +1,183 @@
+"""
+FFT backends for the STFT/ISTFT in core/audio_utils.py.
+
+Three backends are available:
+
+- "scipy"  : scipy.fft with a configurable number of worker threads (default)
+- "numpy"  : numpy.fft, single-threaded, always available
+- "pyfftw" : FFTW through pyFFTW if installed, with one cached plan per
+             (direction, n, dtype) for a fixed batch of PLAN_BATCH frames
+
+The backend and worker count are chosen with the NOISE_FFT_BACKEND and
+NOISE_FFT_WORKERS environment variables, or at runtime with set_backend().
+Worker count defaults to the number of CPUs.
+"""
+
+from collections import OrderedDict
+import os
+import threading
+import numpy as np
+
+try:
+    import scipy.fft as scipy_fft
+except ImportError:
+    scipy_fft = None
+
+try:
+    import pyfftw
+    import pyfftw.builders
+except ImportError:
+    pyfftw = None
+
+
+# Frames per planned FFTW call. Larger batches run as several calls and a shorter
+# last block is zero-padded, so one plan serves every batch size (no re-planning for
+# each new frame count) and a frame's result does not depend on how it was batched.
+PLAN_BATCH = 64
+# Most plans kept by PyFFTW; each holds its own input and output arrays
+MAX_PLANS = 8
+
+
+class NumpyFFT:
+    name = "numpy"
+    workers = 1
+
+    def rfft(self, a, n=None, axis=-1):
+        return np.fft.rfft(a, n=n, axis=axis)
+
+    def irfft(self, a, n=None, axis=-1):
+        return np.fft.irfft(a, n=n, axis=axis)
+
+
+class ScipyFFT:
+    name = "scipy"
+
+    def __init__(self, workers):
+        self.workers = workers
+
+    def rfft(self, a, n=None, axis=-1):
+        return scipy_fft.rfft(a, n=n, axis=axis, workers=self.workers)
+
+    def irfft(self, a, n=None, axis=-1):
+        return scipy_fft.irfft(a, n=n, axis=axis, workers=self.workers)
+
+
+class PyFFTW:
+    name = "pyfftw"
+
+    def __init__(self, workers, planner_effort="FFTW_MEASURE"):
+        self.workers = workers
+        self.planner_effort = planner_effort
+        # (direction, n, dtype, frame length) -> planned FFTW object, least recently
+        # used first
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _plan(self, builder, direction, n, dtype, length):
+        # Called with the lock held
+        key = (direction, n, dtype.str, length)
+        plan = self._plans.get(key)
+        if plan is not None:
+            self._plans.move_to_end(key)
+            return plan
+
+        # Builders plan on their own internal arrays, so planning never clobbers
+        # the caller's data
+        plan = builder(
+            np.zeros((PLAN_BATCH, length), dtype=dtype),
+            n=n,
+            axis=-1,
+            threads=self.workers,
+            planner_effort=self.planner_effort,
+        )
+        self._plans[key] = plan
+        while len(self._plans) > MAX_PLANS:
+            self._plans.popitem(last=False)
+        return plan
+
+    def _execute(self, builder, direction, a, n, axis):
+        # Transform along the last axis of a (rows, length) view of the input
+        a = np.moveaxis(np.asarray(a), axis, -1)
+        leading = a.shape[:-1]
+        rows = a.reshape(-1, a.shape[-1])
+
+        with self._lock:
+            plan = self._plan(builder, direction, n, rows.dtype, rows.shape[-1])
+            output = np.empty(
+                (rows.shape[0], plan.output_array.shape[-1]),
+                dtype=plan.output_array.dtype,
+            )
+            for start in range(0, rows.shape[0], PLAN_BATCH):
+                block = rows[start : start + PLAN_BATCH]
+                count = block.shape[0]
+                if count < PLAN_BATCH:
+                    # Zero-pad the last block to the planned batch size
+                    padded = np.zeros((PLAN_BATCH, rows.shape[-1]), dtype=rows.dtype)
+                    padded[:count] = block
+                    block = padded
+                # The plan reuses its output array on every call, so copy it out
+                output[start : start + count] = plan(block)[:count]
+
+        return np.moveaxis(output.reshape(leading + output.shape[-1:]), -1, axis)
+
+    def rfft(self, a, n=None, axis=-1):
+        return self._execute(pyfftw.builders.rfft, "rfft", a, n, axis)
+
+    def irfft(self, a, n=None, axis=-1):
+        return self._execute(pyfftw.builders.irfft, "irfft", a, n, axis)
+
+    @property
+    def cached_plans(self):
+        return len(self._plans)
+
+
+def available_backends():
+    """Returns the names of the backends that can be used on this machine."""
+    names = ["numpy"]
+    if scipy_fft is not None:
+        names.insert(0, "scipy")
+    if pyfftw is not None:
+        names.append("pyfftw")
+    return names
+
+
+def make_backend(name=None, workers=None):
+    """
+    Creates an FFT backend.
+
+    :param name: "scipy", "numpy", "pyfftw", or None to use NOISE_FFT_BACKEND (default "scipy").
+    :param workers: Thread count, or None to use NOISE_FFT_WORKERS (default: CPU count).
+    """
+    name = name or os.environ.get("NOISE_FFT_BACKEND", "scipy")
+    if workers is None:
+        workers = int(os.environ.get("NOISE_FFT_WORKERS", os.cpu_count() or 1))
+
+    if name not in available_backends():
+        # Fall back rather than fail: FFT results are the same, only speed differs
+        name = "scipy" if scipy_fft is not None else "numpy"
+
+    if name == "scipy":
+        return ScipyFFT(workers)
+    if name == "pyfftw":
+        return PyFFTW(workers)
+    return NumpyFFT()
+
+
+_backend = make_backend()
+
+
+def get_backend():
+    """Returns the backend used by manual_stft/manual_istft."""
+    return _backend
+
+
+def set_backend(name=None, workers=None):
+    """Switches the backend used by manual_stft/manual_istft and returns it."""
+    global _backend
+    _backend = make_backend(name, workers)
+    return _backend
+
+
+def describe_backend():
+    """Returns the active backend settings, e.g. for benchmark reports."""
+    return {"fft_backend": _backend.name, "fft_workers": _backend.workers}
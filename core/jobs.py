@@ -0,0 +1,178 @@
+"""
+Background execution of processing jobs with cancellation.
+
+JobScheduler runs jobs one at a time on a single worker thread. Submitting a job
+cancels the one that is running and replaces the one that is waiting, so only
+the newest request is ever worked on and results always arrive in request order:
+
+- A burst of requests (e.g. repeated clicks on "Update Filter") is coalesced:
+  each request waits `delay` seconds for a newer one before it starts.
+- A running job is cancelled cooperatively. The job receives a CancelToken and
+  calls token.check() at safe points (NoiseCanceller.process does this between
+  blocks of STFT frames), which raises Cancelled once a newer job is submitted.
+- Results, errors and progress are handed to `post`, e.g. a Tk after() wrapper,
+  so callbacks run on the UI thread. A job that was superseded after finishing
+  but before its result was delivered is dropped there as well.
+"""
+
+import threading
+import time
+
+
+class Cancelled(Exception):
+    """Raised inside a job when its CancelToken has been cancelled."""
+
+
+class CancelToken:
+    """Flag shared between a job and whoever may cancel it."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Cancellation checkpoint: raises Cancelled if the job should stop."""
+        if self._event.is_set():
+            raise Cancelled()
+
+
+class _Job:
+    def __init__(self, work, on_success, on_error, on_progress, start_at):
+        self.work = work
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.start_at = start_at
+        self.token = CancelToken()
+
+
+class JobScheduler:
+    """
+    Single-worker job queue that keeps only the newest job.
+
+    :param post: Called with a zero-argument function that must run on the UI thread,
+        e.g. lambda callback: app.after(0, callback). None calls it on the worker.
+    :param delay: Seconds a job waits for a newer submission before it starts.
+    """
+
+    def __init__(self, post=None, delay=0.1):
+        self.post = post if post is not None else (lambda callback: callback())
+        self.delay = delay
+
+        self._condition = threading.Condition()
+        # Job waiting to start, and job running on the worker
+        self._pending = None
+        self._active = None
+        self._thread = None
+        # Most recently submitted job, the only one whose callbacks may still run
+        self._latest = None
+
+        # Instrumentation
+        self.completed = 0
+        self.superseded = 0
+
+    def submit(self, work, on_success=None, on_error=None, on_progress=None):
+        """
+        Queues work(token, progress) in place of any earlier job.
+
+        :param work: Function of a CancelToken and a progress(fraction) callback,
+            returning the result.
+        :param on_success: Called with the result on the UI thread.
+        :param on_error: Called with the exception on the UI thread.
+        :param on_progress: Called with a fraction 0..1 on the UI thread.
+        :return: The job's CancelToken.
+        """
+        job = _Job(
+            work,
+            on_success,
+            on_error,
+            on_progress,
+            time.monotonic() + self.delay,
+        )
+        with self._condition:
+            self._supersede()
+            self._pending = job
+            self._latest = job
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return job.token
+
+    def cancel(self):
+        """Drops the waiting job and cancels the running one."""
+        with self._condition:
+            self._supersede()
+            self._latest = None
+            self._condition.notify()
+
+    @property
+    def busy(self):
+        """True while a job is waiting or running."""
+        with self._condition:
+            return self._pending is not None or self._active is not None
+
+    def _supersede(self):
+        # Called with the condition held
+        for job in (self._pending, self._active):
+            if job is not None and not job.token.cancelled:
+                job.token.cancel()
+                self.superseded += 1
+        self._pending = None
+
+    def _next_job(self):
+        # Waits for a job that has had no newer submission for `delay` seconds
+        with self._condition:
+            while True:
+                job = self._pending
+                if job is None:
+                    self._condition.wait()
+                    continue
+                remaining = job.start_at - time.monotonic()
+                if remaining > 0:
+                    # A newer submission replaces self._pending while waiting
+                    self._condition.wait(remaining)
+                    continue
+                self._pending = None
+                self._active = job
+                return job
+
+    def _run(self):
+        while True:
+            job = self._next_job()
+            token = job.token
+
+            def progress(fraction, job=job):
+                if job.on_progress is not None and not job.token.cancelled:
+                    self._deliver(job, job.on_progress, fraction)
+
+            try:
+                result = job.work(token, progress)
+                callback, value = job.on_success, result
+            except Cancelled:
+                callback = None
+            except Exception as e:
+                callback, value = job.on_error, e
+
+            with self._condition:
+                self._active = None
+                if not token.cancelled:
+                    self.completed += 1
+
+            if callback is not None:
+                self._deliver(job, callback, value)
+
+    def _deliver(self, job, callback, value):
+        # Checked again on the UI thread, where a newer submit() may have run meanwhile,
+        # even if this job had already finished by then
+        def deliver():
+            if job is self._latest and not job.token.cancelled:
+                callback(value)
+
+        self.post(deliver)
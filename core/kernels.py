@@ -0,0 +1,126 @@
+"""
+Spectral subtraction kernels.
+
+Spectral subtraction only rescales each STFT bin:
+
+    max(beta * |S|, |S| - alpha * |N|) * exp(i * angle(S))  ==  S * max(beta, 1 - alpha * |N| / |S|)
+
+so instead of splitting S into magnitude and phase and rebuilding it, we multiply
+S in place by a real gain. The matrix is processed in tiles of time frames that
+fit in cache, so the only temporary is one tile-sized gain buffer.
+
+A numba kernel is used when numba is installed; otherwise (or when
+NOISE_SUBTRACTION_KERNEL=numpy) the pure NumPy version runs.
+"""
+
+import os
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Size of one tile of the complex STFT; a few hundred KB fits in L2 on most CPUs
+TILE_BYTES = 256 * 1024
+
+
+def _gain_mask_numpy(stft_matrix, noise_scaled, beta):
+    n_frames, n_bins = stft_matrix.shape
+    tile_frames = max(1, TILE_BYTES // max(1, n_bins * stft_matrix.itemsize))
+    gain = np.empty((min(tile_frames, n_frames), n_bins), dtype=noise_scaled.dtype)
+
+    # Silent bins give 0/0 or x/0 here; fmax below maps the resulting nan/-inf to beta
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, n_frames, tile_frames):
+            tile = stft_matrix[start : start + tile_frames]
+            g = gain[: tile.shape[0]]
+
+            # g = max(beta, 1 - alpha * |N| / |S|)
+            np.abs(tile, out=g)
+            np.divide(noise_scaled, g, out=g)
+            np.subtract(1, g, out=g)
+            np.fmax(g, beta, out=g)
+
+            # Rescale the bins in place; the phase is untouched
+            tile *= g
+
+
+if numba is not None:
+
+    @numba.njit(cache=True, nogil=True, parallel=True)
+    def _gain_mask_numba(stft_matrix, noise_scaled, beta):
+        n_frames, n_bins = stft_matrix.shape
+        # Frames are independent, so spread them over the available cores
+        for i in numba.prange(n_frames):
+            for k in range(n_bins):
+                value = stft_matrix[i, k]
+                # sqrt(re^2 + im^2) vectorizes far better than abs() (hypot)
+                magnitude = np.sqrt(value.real * value.real + value.imag * value.imag)
+                gain = beta
+                if magnitude > 0:
+                    gain = 1 - noise_scaled[k] / magnitude
+                    if not gain > beta:
+                        gain = beta
+                stft_matrix[i, k] = value * gain
+
+else:
+    _gain_mask_numba = None
+
+
+def available_kernels():
+    """Returns the names of the kernels that can run on this machine."""
+    return ["numpy"] + (["numba"] if _gain_mask_numba is not None else [])
+
+
+def default_kernel():
+    """Kernel chosen by NOISE_SUBTRACTION_KERNEL, or numba when available."""
+    requested = os.environ.get("NOISE_SUBTRACTION_KERNEL", "auto")
+    if requested == "auto":
+        return "numba" if _gain_mask_numba is not None else "numpy"
+    if requested not in available_kernels():
+        raise ValueError(f"Subtraction kernel {requested!r} is not available")
+    return requested
+
+
+def apply_gain_mask(stft_matrix, mag_noise, alpha, beta, kernel=None):
+    """
+    Applies spectral subtraction to a complex (frames, bins) or (channels, frames, bins)
+    STFT in place.
+
+    Args:
+        stft_matrix: C-contiguous complex STFT, modified in place.
+        mag_noise: Noise magnitude profile broadcastable to one frame (bins,) or (1, bins),
+            or one profile per channel (channels, 1, bins) for a multichannel STFT.
+        alpha: Over-subtraction factor.
+        beta: Spectral floor.
+        kernel: "numpy", "numba" or None for default_kernel().
+
+    Returns:
+        stft_matrix, for convenience.
+    """
+    kernel = kernel or default_kernel()
+
+    if stft_matrix.ndim == 3:
+        # Each channel is a contiguous (frames, bins) block with its own profile, or all
+        # channels share one
+        n_bins = stft_matrix.shape[-1]
+        channel_noise = np.broadcast_to(
+            np.reshape(mag_noise, (-1, n_bins)), (stft_matrix.shape[0], n_bins)
+        )
+        for channel, noise in zip(stft_matrix, channel_noise):
+            apply_gain_mask(channel, noise, alpha, beta, kernel)
+        return stft_matrix
+
+    # Fold alpha into the noise once, in the precision of the STFT
+    real_dtype = np.finfo(stft_matrix.dtype).dtype
+    noise_scaled = np.ascontiguousarray(
+        (alpha * np.ravel(mag_noise)).astype(real_dtype)
+    )
+    beta = real_dtype.type(beta)
+
+    if kernel == "numba":
+        _gain_mask_numba(stft_matrix, noise_scaled, beta)
+    else:
+        _gain_mask_numpy(stft_matrix, noise_scaled, beta)
+    return stft_matrix
@@ -0,0 +1,163 @@
+"""
+Caches averaged noise profiles so a noise recording that is reused for many
+inputs is only analysed once.
+
+Profiles are keyed by the SHA-256 of the noise file's bytes together with the
+STFT settings, so renaming or copying a file still hits the cache while editing
+it does not. An optional directory keeps profiles as .npy files across restarts.
+"""
+
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+import threading
+import numpy as np
+
+
+class NoiseProfileCache:
+    """
+    In-memory LRU cache of noise profiles with an optional on-disk tier.
+
+    :param max_entries: Maximum number of profiles kept in memory.
+    :param max_bytes: Maximum total size of the profiles kept in memory.
+    :param cache_dir: Directory for .npy copies of the profiles, or None to disable.
+    """
+
+    def __init__(self, max_entries=16, max_bytes=64 * 1024 * 1024, cache_dir=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+
+        # Key -> profile array, least recently used first
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # (path, size, mtime) -> content hash, so unchanged files are not re-hashed
+        self._hashes = {}
+        # The app processes on background threads
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _content_hash(self, path):
+        stat = os.stat(path)
+        file_id = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if file_id in self._hashes:
+                return self._hashes[file_id]
+
+        # Hash in 1 MB chunks so large noise files are never fully in memory. This runs
+        # without the lock, so other threads can use the cache meanwhile; two threads
+        # hashing the same new file just get the same result.
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        content_hash = digest.hexdigest()
+        with self._lock:
+            self._hashes[file_id] = content_hash
+        return content_hash
+
+    def _disk_path(self, key):
+        return os.path.join(
+            self.cache_dir, "_".join(str(part) for part in key) + ".npy"
+        )
+
+    def _load(self, key):
+        # A file that cannot be read (e.g. left truncated by an older version) counts
+        # as a miss; the profile is recomputed and the file replaced
+        try:
+            return np.load(self._disk_path(key))
+        except (OSError, ValueError, EOFError):
+            return None
+
+    def _save(self, key, profile):
+        # Write to a temporary file in the same directory, then rename it into place.
+        # The rename is atomic, so an interrupted run or another process sharing the
+        # directory never sees a half-written profile.
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".npy.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, profile)
+            os.replace(temp_path, self._disk_path(key))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def _store(self, key, profile):
+        # Profiles are shared between callers, so make sure nobody modifies them
+        profile.flags.writeable = False
+
+        self._entries[key] = profile
+        self._bytes += profile.nbytes
+
+        # Evict least recently used profiles until both budgets are met
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def get(self, noise_path, M, hop, window_name, precision, compute, mono=True):
+        """
+        Returns the noise profile for noise_path with the given STFT settings.
+
+        :param compute: Function called with no arguments to build the profile on a miss.
+        :param mono: False if the profile has one row per channel of the file.
+        """
+        key = (self._content_hash(noise_path), M, hop, window_name, precision)
+        if not mono:
+            key += ("channels",)
+
+        with self._lock:
+            # 1. Memory tier
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+            # 2. Disk tier
+            if self.cache_dir and os.path.exists(self._disk_path(key)):
+                profile = self._load(key)
+                if profile is not None:
+                    self.disk_hits += 1
+                    self._store(key, profile)
+                    return profile
+
+            self.misses += 1
+
+        # 3. Compute outside the lock so other threads can still read the cache
+        profile = np.asarray(compute())
+
+        with self._lock:
+            if self.cache_dir:
+                self._save(key, profile)
+            self._store(key, profile)
+        return profile
+
+    def clear(self):
+        """Empties the memory tier (files on disk are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Returns hit/miss counters and the current memory usage."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
@@ -0,0 +1,130 @@
+"""
+Online noise estimation, for streams without a separate noise recording.
+
+NoiseTracker follows the noise spectrum frame by frame using minima controlled
+recursive averaging (MCRA, Cohen & Berdugo 2002):
+
+1. The power of each bin is smoothed over time.
+2. The minimum of the smoothed power over the last one to two windows of
+   `min_window` frames is tracked. Speech rarely stays in a bin that long, so the
+   minimum follows the noise floor.
+3. A bin whose smoothed power is well above that minimum is counted as speech, and
+   a smoothed speech-presence probability is kept per bin.
+4. The noise power is averaged recursively, more slowly where speech is likely, so
+   speech does not leak into the estimate.
+
+Every update is a handful of element-wise operations on preallocated (bins,)
+arrays, so it costs O(bins) and never allocates, which makes it usable inside an
+audio callback. The estimate adapts to noise that changes over time, unlike the
+single averaged profile of a noise file.
+"""
+
+import numpy as np
+
+# Smoothing of the bin powers used for minimum tracking
+POWER_SMOOTHING = 0.8
+# Smoothing of the noise estimate while no speech is present
+NOISE_SMOOTHING = 0.95
+# Smoothing of the speech-presence probability
+PRESENCE_SMOOTHING = 0.2
+# Ratio of smoothed power to minimum above which a bin counts as speech (~7 dB)
+PRESENCE_THRESHOLD = 5.0
+# Length of one minimum-search window
+MIN_WINDOW_SECONDS = 0.8
+
+# Mean magnitude of a complex Gaussian bin is sqrt(pi / 4) times its RMS, so this
+# converts the power estimate to the mean-magnitude scale of estimate_noise_profile()
+_MAGNITUDE_SCALE = np.sqrt(np.pi) / 2
+
+
+def min_window_frames(rate, hop, seconds=MIN_WINDOW_SECONDS):
+    """Returns the number of frames in one minimum-search window of `seconds`."""
+    return max(1, int(round(seconds * rate / hop)))
+
+
+class NoiseTracker:
+    """
+    Per-frame noise magnitude estimate.
+
+    :param bins: Number of frequency bins per frame (M // 2 + 1).
+    :param min_window: Frames per minimum-search window, see min_window_frames().
+    :param dtype: Real dtype of the state, normally that of the STFT.
+    """
+
+    def __init__(self, bins, min_window=32, dtype=np.float64):
+        self.bins = bins
+        self.min_window = min_window
+        self.dtype = np.dtype(dtype)
+        self.frames = 0
+
+        # State, one value per bin
+        self._smoothed = np.zeros(bins, dtype=self.dtype)
+        self._minimum = np.zeros(bins, dtype=self.dtype)
+        self._window_minimum = np.zeros(bins, dtype=self.dtype)
+        self._presence = np.zeros(bins, dtype=self.dtype)
+        self._noise_power = np.zeros(bins, dtype=self.dtype)
+
+        # Scratch buffers
+        self._power = np.zeros(bins, dtype=self.dtype)
+        self._scratch = np.zeros(bins, dtype=self.dtype)
+        self._speech = np.zeros(bins, dtype=bool)
+
+        # Current estimate, updated in place by update()
+        self.magnitude = np.zeros(bins, dtype=self.dtype)
+
+    def reset(self):
+        """Forgets all history; the next frame restarts the estimate."""
+        self.frames = 0
+
+    def update(self, spectrum):
+        """
+        Updates the estimate with one complex STFT frame of length bins.
+
+        Returns:
+            self.magnitude, the noise magnitude per bin. The array is reused, so copy
+            it if it has to outlive the next update.
+        """
+        power = self._power
+        scratch = self._scratch
+
+        # |S|^2 of the frame
+        np.abs(spectrum, out=power)
+        np.multiply(power, power, out=power)
+
+        if self.frames == 0:
+            # Nothing to smooth against yet: start from the first frame
+            for state in (self._smoothed, self._minimum, self._window_minimum):
+                state[:] = power
+            self._noise_power[:] = power
+            self._presence[:] = 0
+        else:
+            # 1. Smoothed power
+            self._smoothed *= POWER_SMOOTHING
+            np.multiply(power, 1 - POWER_SMOOTHING, out=scratch)
+            self._smoothed += scratch
+
+            # 2. Minimum over the current and the previous window
+            np.minimum(self._minimum, self._smoothed, out=self._minimum)
+            np.minimum(self._window_minimum, self._smoothed, out=self._window_minimum)
+            if self.frames % self.min_window == 0:
+                self._minimum[:] = self._window_minimum
+                self._window_minimum[:] = self._smoothed
+
+            # 3. Speech-presence probability
+            np.multiply(self._minimum, PRESENCE_THRESHOLD, out=scratch)
+            np.greater(self._smoothed, scratch, out=self._speech)
+            self._presence *= PRESENCE_SMOOTHING
+            np.multiply(self._speech, 1 - PRESENCE_SMOOTHING, out=scratch)
+            self._presence += scratch
+
+            # 4. noise = a * noise + (1 - a) * power, with a -> 1 where speech is present
+            np.multiply(self._presence, 1 - NOISE_SMOOTHING, out=scratch)
+            scratch += NOISE_SMOOTHING
+            self._noise_power -= power
+            self._noise_power *= scratch
+            self._noise_power += power
+
+        self.frames += 1
+        np.sqrt(self._noise_power, out=self.magnitude)
+        self.magnitude *= _MAGNITUDE_SCALE
+        return self.magnitude
@@ -0,0 +1,287 @@
+"""
+Noise cancelling of one long recording on several cores.
+
+The frames of the recording are split into contiguous, hop-aligned segments and
+each segment is denoised in its own worker process. Input and output samples live
+in shared memory (multiprocessing.shared_memory), so workers read their part of
+the signal and write their part of the result without pickling audio.
+
+A segment's first output samples are also covered by the last frames of the
+previous segment, so every worker re-analyses those few overlapping frames
+(ceil(M / hop) - 1 of them, one at 50% overlap) and overlap-adds them in the same
+order as the serial path. Each worker then writes only the samples it owns, and
+the stitched result is sample-identical to NoiseCanceller.process().
+
+Workers are spawned rather than forked, since forking after numba or the FFT
+library has started its threads can deadlock. Starting them costs about a second,
+so this only pays off for recordings of a few minutes or more.
+
+Run from the project root:
+    python -m core.parallel INPUT.wav NOISE.wav OUTPUT.wav [--M 256] [--alpha 1.05] [--beta 0.001] [--workers N] [--format int16]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from . import kernels
+from .audio_utils import (
+    read_audio,
+    manual_stft,
+    hanning_window,
+    save_audio,
+    SAMPLE_FORMATS,
+)
+from .fft_backend import get_backend, set_backend
+from .processing import NoiseCanceller, render_frames
+
+# Segments per worker; a few more than one evens out workers that start late
+SEGMENTS_PER_WORKER = 2
+
+
+def limit_worker_threads(threads=1):
+    """
+    Caps the FFT backend and the numba kernel of this process at `threads` threads.
+
+    Both default to one thread per CPU, so a pool of N worker processes would start
+    about N x N threads; call this in the pool initializer instead.
+    """
+    set_backend(get_backend().name, workers=threads)
+    if kernels.numba is not None:
+        kernels.numba.set_num_threads(
+            min(threads, kernels.numba.config.NUMBA_NUM_THREADS)
+        )
+
+
+def _init_worker():
+    # The workers already fill every core, so keep each one single-threaded instead
+    # of oversubscribing with FFT and numba threads
+    limit_worker_threads(1)
+
+
+def split_frames(n_frames, n_segments):
+    """Returns [(first_frame, end_frame), ...] covering range(n_frames) in near-equal parts."""
+    n_segments = max(1, min(n_segments, n_frames))
+    bounds = np.linspace(0, n_frames, n_segments + 1).astype(int)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def denoise_segment(
+    signal, output, first_frame, end_frame, n_frames, mag_noise, M, alpha, beta, window
+):
+    """
+    Denoises frames [first_frame, end_frame) of signal and writes the output samples
+    they own into output.
+
+    Args:
+        signal: The whole input signal (1-D, in the DSP precision).
+        output: The whole output buffer, of length (n_frames - 1) * hop + M.
+        first_frame, end_frame: Frame range of this segment.
+        n_frames: Total number of frames in the signal.
+        mag_noise: Noise magnitude profile.
+        M, alpha, beta: Same as NoiseCanceller.process().
+        window: Analysis window of length M.
+    """
+    R = M // 2
+    # R is passed to the STFT as the overlap, so frames start every M - R samples
+    step = M - R
+
+    def stft_frames(start_frame, end_frame):
+        # Re-analyse the frames from the signal; each segment only sees its own slice
+        segment = signal[start_frame * step : (end_frame - 1) * step + M]
+        return manual_stft(segment, 1, window, M, R)[2]
+
+    # Same STFT -> gain mask -> synthesis as the serial path, keeping only the samples
+    # this segment owns
+    owned_start, samples = render_frames(
+        stft_frames, first_frame, end_frame, n_frames, mag_noise, M, alpha, beta, window
+    )
+    output[owned_start : owned_start + samples.shape[-1]] = samples
+
+
+def _denoise_shared_segment(
+    input_name,
+    output_name,
+    n_samples,
+    output_length,
+    dtype,
+    first_frame,
+    end_frame,
+    n_frames,
+    mag_noise,
+    M,
+    alpha,
+    beta,
+    precision,
+):
+    # Attach to the parent's buffers; nothing but the names and the frame range is sent
+    input_shm = shared_memory.SharedMemory(name=input_name)
+    output_shm = shared_memory.SharedMemory(name=output_name)
+    try:
+        signal = np.ndarray((n_samples,), dtype=dtype, buffer=input_shm.buf)
+        output = np.ndarray((output_length,), dtype=dtype, buffer=output_shm.buf)
+        window = hanning_window(M, precision)
+        denoise_segment(
+            signal,
+            output,
+            first_frame,
+            end_frame,
+            n_frames,
+            mag_noise,
+            M,
+            alpha,
+            beta,
+            window,
+        )
+        # The views must be gone before the shared memory can be closed
+        del signal, output
+    finally:
+        input_shm.close()
+        output_shm.close()
+    return end_frame - first_frame
+
+
+def process_parallel(
+    input_path, noise_path, M, alpha, beta, workers=None, canceller=None
+):
+    """
+    Denoises one file using a process pool.
+
+    Args:
+        input_path: Path to the noisy speech file.
+        noise_path: Path to the noise profile file.
+        M, alpha, beta: Same as NoiseCanceller.process().
+        workers: Number of worker processes (defaults to the CPU count).
+        canceller: NoiseCanceller providing the noise profile cache and precision.
+
+    Returns:
+        (sample_rate, cleaned_audio), with cleaned_audio identical to
+        NoiseCanceller.process()["cleaned_audio"].
+    """
+    canceller = canceller if canceller is not None else NoiseCanceller()
+    workers = workers or os.cpu_count() or 1
+
+    # 1. Load the input and the noise profile once, in the parent
+    rate, input_data = read_audio(input_path)
+    input_data = input_data.astype(canceller.dtype, copy=False)
+    mag_noise = canceller.noise_profile(noise_path, M)
+    window = hanning_window(M, canceller.precision)
+
+    step = M - M // 2
+    n_frames = max((input_data.size - M) // step + 1, 0)
+    # Same length as overlap_add() of all frames in the serial path
+    output_length = (n_frames - 1) * step + M
+    segments = split_frames(n_frames, workers * SEGMENTS_PER_WORKER)
+
+    # Nothing to share for a single segment; run it here
+    if workers == 1 or len(segments) == 1:
+        output = np.zeros(output_length, dtype=canceller.dtype)
+        if n_frames > 0:
+            denoise_segment(
+                input_data,
+                output,
+                0,
+                n_frames,
+                n_frames,
+                mag_noise,
+                M,
+                alpha,
+                beta,
+                window,
+            )
+        return rate, output
+
+    # 2. Put the input and the output in shared memory
+    input_shm = shared_memory.SharedMemory(create=True, size=input_data.nbytes)
+    output_shm = shared_memory.SharedMemory(
+        create=True, size=output_length * canceller.dtype.itemsize
+    )
+    try:
+        shared_input = np.ndarray(
+            input_data.shape, dtype=canceller.dtype, buffer=input_shm.buf
+        )
+        shared_input[:] = input_data
+        shared_output = np.ndarray(
+            (output_length,), dtype=canceller.dtype, buffer=output_shm.buf
+        )
+
+        # 3. Each worker writes a disjoint range of the output, so no locking is needed
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(segments)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _denoise_shared_segment,
+                    input_shm.name,
+                    output_shm.name,
+                    input_data.size,
+                    output_length,
+                    canceller.dtype.str,
+                    first_frame,
+                    end_frame,
+                    n_frames,
+                    mag_noise,
+                    M,
+                    alpha,
+                    beta,
+                    canceller.precision,
+                )
+                for first_frame, end_frame in segments
+            ]
+            for future in futures:
+                future.result()
+
+        # 4. Copy out before the shared memory is released
+        cleaned_audio = shared_output.copy()
+        del shared_input, shared_output
+    finally:
+        input_shm.close()
+        input_shm.unlink()
+        output_shm.close()
+        output_shm.unlink()
+
+    return rate, cleaned_audio
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Clean one long recording using several processes."
+    )
+    parser.add_argument("input_path", help="Noisy WAV file")
+    parser.add_argument("noise_path", help="WAV file containing a sample of the noise")
+    parser.add_argument("output_path", help="Where to write the cleaned WAV file")
+    parser.add_argument("--M", type=int, default=256, help="Window (FFT) size")
+    parser.add_argument("--alpha", type=float, default=1.05, help="Over-subtraction")
+    parser.add_argument("--beta", type=float, default=0.001, help="Spectral floor")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=list(SAMPLE_FORMATS),
+        default="int16",
+        help="Sample format of the cleaned file",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rate, cleaned_audio = process_parallel(
+        args.input_path, args.noise_path, args.M, args.alpha, args.beta, args.workers
+    )
+    save_audio(args.output_path, rate, cleaned_audio, args.format)
+    wall_time = time.perf_counter() - start
+
+    seconds = cleaned_audio.size / rate
+    print(
+        f"Cleaned {seconds:.1f} s of audio in {wall_time:.2f} s "
+        f"({seconds / wall_time:.1f}x realtime)"
+    )
+
+
+if __name__ == "__main__":
+    main()
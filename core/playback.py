@@ -0,0 +1,261 @@
+"""
+Gapless playback of several versions of the same recording.
+
+TrackPlayer keeps one sounddevice OutputStream open and fills it from float32
+copies of every track made up front. Seeking, pausing and switching between
+tracks only change a few attributes that the audio callback reads at the start
+of its next block, so they take effect within one block without copying audio
+or reopening the device.
+
+Only the audio callback writes the read position. Other threads ask for a new
+position by appending to a deque, which the callback drains; appending and
+popping are atomic in CPython, so no lock is needed and the callback never waits
+on the UI thread. The track key and the playing flag are plain attribute
+assignments, which are atomic as well.
+
+playback_time() follows the audio clock rather than the read position: every
+callback records the DAC time at which its block will be heard, so the UI can
+tell which sample is reaching the speakers, output latency included.
+
+splice() replaces part of a track while it plays, e.g. with a preview rendered
+for new filter settings. It writes into the track in place and crossfades from
+the old audio at the read position, so the change is heard from the next block.
+"""
+
+from collections import deque
+import numpy as np
+
+# Length of the crossfade when splice() swaps in new audio
+CROSSFADE_SECONDS = 0.02
+
+
+class TrackPlayer:
+    """
+    Plays one of several equally-timed tracks through a persistent output stream.
+
+    :param blocksize: Samples per callback.
+    :param latency: Output latency passed to sounddevice ("low", "high" or seconds).
+    :param device: sounddevice output device name or index, or None for the default.
+    """
+
+    def __init__(self, blocksize=2048, latency="high", device=None):
+        self.blocksize = blocksize
+        self.latency = latency
+        self.device = device
+        self.rate = None
+        self.stream = None
+
+        self._tracks = {}
+        self._track = None
+        # Read position in samples, written only by the audio callback
+        self._position = 0
+        # Seek requests from other threads, applied by the audio callback
+        self._seeks = deque()
+        self.playing = False
+        # Position of the last seek, and (block position, DAC time, last seek) of the
+        # last block played, both written only by the audio callback
+        self._segment_start = 0
+        self._clock = None
+
+        # Instrumentation
+        self.underflows = 0
+
+    def set_tracks(self, tracks, rate):
+        """
+        Replaces the tracks with new audio, e.g. after re-processing.
+
+        :param tracks: {key: 1-D float array}; (channels, samples) arrays are mixed to mono.
+        :param rate: Sample rate shared by all tracks.
+        """
+        converted = {}
+        for key, data in tracks.items():
+            data = np.asarray(data)
+            if data.ndim == 2:
+                data = data.mean(axis=0)
+            # Always a copy, even of float32 input: splice() writes into these
+            # buffers and must never modify the caller's arrays
+            converted[key] = np.array(data, dtype=np.float32, copy=True)
+
+        if self.rate != rate:
+            # The stream runs at a fixed rate, so reopen it on the next play()
+            self.close()
+            self.rate = rate
+
+        # One assignment, so the callback sees either the old tracks or the new ones
+        self._tracks = converted
+        if self._track not in converted:
+            self._track = next(iter(converted), None)
+
+    def splice(self, key, start, audio):
+        """
+        Overwrites a track from sample `start` on with `audio`, in place.
+
+        The new audio is crossfaded in over CROSSFADE_SECONDS at both ends of the
+        region, so it blends into the old audio around it. If the read position lies
+        inside the region, samples before it are left alone (they have been played)
+        and the crossfade starts there instead.
+
+        :param key: Track to change.
+        :param start: First sample to replace.
+        :param audio: 1-D float array; (channels, samples) arrays are mixed to mono.
+        """
+        track = self._tracks.get(key)
+        audio = np.asarray(audio)
+        if audio.ndim == 2:
+            audio = audio.mean(axis=0)
+        if track is None or not self.rate:
+            return
+
+        stop = min(start + audio.size, track.size)
+        if stop <= start:
+            return
+        fade = max(int(CROSSFADE_SECONDS * self.rate), 1)
+        ramp = np.linspace(0, 1, fade + 1, dtype=np.float32)[1:]
+
+        # 1. Weight of the new audio per sample, 1 inside the region
+        weight = np.ones(stop - start, dtype=np.float32)
+
+        def fade_in(at):
+            end = min(at + fade, weight.size)
+            weight[:at] = 0
+            np.minimum(weight[at:end], ramp[: end - at], out=weight[at:end])
+
+        if start > 0:
+            fade_in(0)
+        if stop < track.size:
+            tail = weight[-fade:]
+            np.minimum(tail, ramp[::-1][-tail.size :], out=tail)
+        position = self._position
+        if self.playing and start < position < stop:
+            fade_in(position - start)
+
+        # 2. track += weight * (new - old), one in-place update of the region
+        delta = audio[: stop - start].astype(np.float32)
+        delta -= track[start:stop]
+        delta *= weight
+        track[start:stop] += delta
+
+    def select(self, key):
+        """Switches to another track at the current position."""
+        self._track = key
+
+    @property
+    def track(self):
+        return self._track
+
+    def seek(self, seconds):
+        """Moves the read position; applied at the next block."""
+        position = max(int(seconds * self.rate), 0) if self.rate else 0
+        self._seeks.append(position)
+
+    @property
+    def position(self):
+        """The read position in samples, including a seek that is not applied yet."""
+        seeks = self._seeks
+        try:
+            return seeks[-1]
+        except IndexError:
+            return self._position
+
+    @property
+    def time(self):
+        """The read position in seconds."""
+        return self.position / self.rate if self.rate else 0.0
+
+    def playback_time(self):
+        """
+        The time (seconds) of the sample being heard now, from the audio clock.
+
+        Falls back to the read position while paused, before the first block has been
+        played, or when a seek has not been applied yet.
+        """
+        clock = self._clock
+        stream = self.stream
+        if not self.playing or clock is None or stream is None or self._seeks:
+            return self.time
+
+        block_position, dac_time, segment_start = clock
+        # Blocks are contiguous since the last seek, so samples before this block are
+        # still playing if its DAC time has not come yet
+        audible = block_position + (stream.time - dac_time) * self.rate
+        audible = min(max(audible, segment_start), self._position)
+        return audible / self.rate
+
+    @property
+    def duration(self):
+        """Length of the selected track in seconds."""
+        track = self._tracks.get(self._track)
+        if track is None or not self.rate:
+            return 0.0
+        return track.size / self.rate
+
+    def play(self):
+        """Starts (or resumes) playback, opening the stream the first time."""
+        if self.stream is None:
+            self._open()
+        # Silence was played while paused, so the clock restarts from here
+        self._seeks.append(self.position)
+        self.playing = True
+
+    def pause(self):
+        """
+        Stops advancing; the stream keeps running and outputs silence. The position
+        moves back to the sample that was being heard, so resuming repeats nothing
+        and skips nothing that was still in the output buffer.
+        """
+        heard = self.playback_time()
+        self.playing = False
+        if self.rate:
+            self.seek(heard)
+
+    def _open(self):
+        # Imported here so the core package works on machines without an audio stack
+        import sounddevice as sd
+
+        self.stream = sd.OutputStream(
+            samplerate=self.rate,
+            blocksize=self.blocksize,
+            channels=1,
+            dtype="float32",
+            latency=self.latency,
+            device=self.device,
+            callback=self.callback,
+        )
+        self.stream.start()
+
+    def close(self):
+        """Stops and releases the stream."""
+        self.playing = False
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+    def callback(self, outdata, frames, time_info, status):
+        """sounddevice-compatible output callback."""
+        if status:
+            self.underflows += 1
+
+        # 1. Apply the most recent seek request, if any
+        while self._seeks:
+            self._position = self._seeks.popleft()
+            self._segment_start = self._position
+
+        # 2. Read the track once, so a concurrent switch affects whole blocks only
+        track = self._tracks.get(self._track)
+        if not self.playing or track is None:
+            outdata.fill(0)
+            return
+
+        # 3. Copy the next block and pad with silence at the end of the track
+        position = self._position
+        if time_info is not None:
+            self._clock = (position, time_info.outputBufferDacTime, self._segment_start)
+        n = min(frames, max(track.size - position, 0))
+        outdata[:n, 0] = track[position : position + n]
+        outdata[n:] = 0
+        self._position = position + n
+
+        if n < frames:
+            # Reached the end: stop advancing until the next play()
+            self.playing = False
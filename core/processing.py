@@ -1,9 +1,220 @@
+import os
+import threading
 import numpy as np
-from .audio_utils import read_audio, manual_stft, manual_istft
+from .audio_utils import (
+    WavReader,
+    read_audio,
+    manual_stft,
+    synthesize_frames,
+    overlap_add,
+    normalize_overlap_add,
+    hanning_window,
+    precision_dtype,
+    DEFAULT_PRECISION,
+)
+from .display import DisplaySpectrogram
+from .kernels import apply_gain_mask
+from .noise_cache import NoiseProfileCache
+from .noise_tracker import NoiseTracker, min_window_frames
+from .profiling import StageProfiler, log_profile
+
+# STFT frames handled between two cancellation checkpoints of process()
+PROCESS_BLOCK_FRAMES = 1024
+# Samples read and converted between two cancellation checkpoints while loading
+LOAD_BLOCK_SAMPLES = 1 << 20
+
+
+def estimate_noise_profile(noise_data, window, M, R):
+    """
+    Averages the STFT magnitude of a pure-noise recording into a (1, bins) profile,
+    or (channels, 1, bins) for (channels, samples) noise data.
+    """
+    _, _, noise_stft = manual_stft(noise_data, 1, window, M, R)
+
+    # This assumes the noise is relatively stationary (constant) over time
+    return np.mean(np.abs(noise_stft), axis=-2, keepdims=True)
+
+
+def spectral_subtract(stft_matrix, mag_noise, alpha, beta):
+    """
+    Subtracts alpha * mag_noise from the magnitude of every STFT frame, keeping the
+    original phase and flooring the result at beta times the input magnitude.
+
+    Formula: |Denoised| = max(beta * |Input|, |Input| - alpha * |Noise|)
+    The floor ("spectral floor") prevents negative magnitudes and reduces
+    "musical noise" artifacts. It is applied as a real gain per bin (see
+    core/kernels.py), so the phase is kept without an angle/exp round-trip.
+
+    Returns a new matrix; use apply_gain_mask() directly to work in place.
+    """
+    return apply_gain_mask(np.array(stft_matrix, order="C"), mag_noise, alpha, beta)
+
+
+def render_frames(
+    stft_frames, first_frame, end_frame, n_frames, mag_noise, M, alpha, beta, window
+):
+    """
+    Cleans frames [first_frame, end_frame) and returns the output samples they own,
+    identical to the same samples of a full process() run. Used by preview() and by
+    the segments of core/parallel.py.
+
+    Frame i owns samples [i * hop, (i + 1) * hop) and the last frame owns everything
+    to the end of the output. The ceil(M / hop) - 1 frames before first_frame overlap
+    its first samples, so they are rendered too and then dropped.
+
+    Args:
+        stft_frames: Function of (start_frame, end_frame) returning those frames of
+            the input STFT, shape (..., frames, bins), as an array it may modify.
+        first_frame, end_frame: Frame range to render.
+        n_frames: Total number of frames in the signal.
+        mag_noise: Noise magnitude profile.
+        M, alpha, beta: Same as NoiseCanceller.process().
+        window: Analysis window of length M.
+
+    Returns:
+        (owned_start, samples): the first owned sample index and the owned samples.
+    """
+    # R is passed to the STFT as the overlap, so frames start every M - R samples
+    step = M - M // 2
+    carry_frames = -(-M // step) - 1
+    start_frame = max(first_frame - carry_frames, 0)
+
+    # Same subtraction -> synthesis -> overlap-add as process(), on those frames
+    segment_stft = stft_frames(start_frame, end_frame)
+    apply_gain_mask(segment_stft, mag_noise, alpha, beta)
+    frames = synthesize_frames(segment_stft, window, M)
+    segment_output = overlap_add(frames, step)
+    normalize_overlap_add(segment_output, window, step)
+
+    # Keep the samples these frames own
+    owned_start = first_frame * step
+    owned_end = end_frame * step if end_frame < n_frames else (n_frames - 1) * step + M
+    offset = start_frame * step
+    return owned_start, segment_output[..., owned_start - offset : owned_end - offset]
+
+
+def _first_channel(stft_matrix, mag_noise):
+    # The plot shows one channel: the (frames, bins) STFT and (1, bins) noise profile of
+    # the first channel of a multichannel analysis
+    if stft_matrix.ndim == 3:
+        stft_matrix = stft_matrix[0]
+    if mag_noise.ndim == 3:
+        mag_noise = mag_noise[0]
+    return stft_matrix, mag_noise
+
+
+def _frame_blocks(n_frames, token=None, progress=None, start=0.0, end=1.0):
+    # Yields (first, stop) ranges of PROCESS_BLOCK_FRAMES frames. A cancellation
+    # checkpoint runs before every block, and progress is reported after it, scaled
+    # to start..end of the whole job.
+    n_blocks = max(-(-n_frames // PROCESS_BLOCK_FRAMES), 1)
+    for index, first in enumerate(range(0, max(n_frames, 1), PROCESS_BLOCK_FRAMES)):
+        if token is not None:
+            token.check()
+        yield first, min(first + PROCESS_BLOCK_FRAMES, n_frames)
+        if progress is not None:
+            progress(start + (end - start) * (index + 1) / n_blocks)
+
+
+def _load_audio(path, mono, dtype, token=None):
+    # read_audio() into a dtype array, converted LOAD_BLOCK_SAMPLES at a time with a
+    # cancellation checkpoint before every block
+    try:
+        reader = WavReader(path)
+    except ValueError:
+        # Formats the memory-mapped reader does not understand are read in one go
+        rate, data = read_audio(path, mono)
+        return rate, data.astype(dtype, copy=False)
+
+    shape = (reader.n_samples,) if mono else (reader.channels, reader.n_samples)
+    data = np.empty(shape, dtype=dtype)
+    for start in range(0, reader.n_samples, LOAD_BLOCK_SAMPLES):
+        if token is not None:
+            token.check()
+        stop = min(start + LOAD_BLOCK_SAMPLES, reader.n_samples)
+        data[..., start:stop] = reader.read(start, stop, mono)
+    return reader.rate, data
+
+
+def _cleaned_display(analysis, alpha, beta, quantize=None):
+    # dB spectrogram of the cleaned audio, derived column by column from the cached
+    # input STFT with the given alpha/beta
+    display_stft, mag_noise = _first_channel(
+        analysis["input_stft"], analysis["mag_noise"]
+    )
+    return DisplaySpectrogram(
+        display_stft,
+        analysis["norm_factor"],
+        gain=lambda frames: apply_gain_mask(frames, mag_noise, alpha, beta),
+        quantize=quantize,
+    )
+
+
+def _file_id(path):
+    # Identifies a file version without reading it, so edits invalidate cached analysis
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
 
 
 class NoiseCanceller:
-    def process(self, input_path, noise_path, M, alpha, beta):
+    def __init__(
+        self,
+        noise_cache=None,
+        profile_memory=False,
+        precision=DEFAULT_PRECISION,
+        display_quantize=None,
+        mono=True,
+    ):
+        # Noise profiles are reused across calls; pass a NoiseProfileCache to share
+        # one between instances or to enable the on-disk tier
+        self.noise_cache = (
+            noise_cache if noise_cache is not None else NoiseProfileCache()
+        )
+
+        # Numeric precision of every DSP stage ("float32" or "float64"), see
+        # PRECISIONS in audio_utils for the error this introduces
+        self.precision = precision
+        self.dtype = precision_dtype(precision)
+
+        # Storage of the dB spectrograms for the plot: None converts columns on demand,
+        # "uint8" or "float16" stores quantized levels (see core/display.py)
+        self.display_quantize = display_quantize
+
+        # False keeps every channel: audio is (channels, samples) and the STFT,
+        # subtraction and ISTFT run on all channels at once. A noise file with the same
+        # number of channels gives one profile per channel, a mono one is shared.
+        # The streaming and real-time paths are mono only.
+        self.mono = mono
+
+        # Record allocated bytes per stage in the result's "profile". Off by default:
+        # tracemalloc traces every thread of the process and slows processing down
+        self.profile_memory = profile_memory
+
+        # Analysis of the most recent (input, noise, M), so changing only alpha/beta
+        # skips loading and the STFT
+        self._analysis = None
+        self._analysis_key = None
+        self._analysis_lock = threading.Lock()
+
+    def noise_profile(self, noise_path, M):
+        """
+        Returns the averaged noise magnitude (1, bins) for noise_path, from the cache if possible.
+        Without mono, a multichannel noise file gives (channels, 1, bins).
+        """
+        R = M // 2
+
+        def compute():
+            _, noise_data = read_audio(noise_path, self.mono)
+            window = hanning_window(M, self.precision)
+            return estimate_noise_profile(noise_data.astype(self.dtype), window, M, R)
+
+        return self.noise_cache.get(
+            noise_path, M, M - R, "hann", self.precision, compute, self.mono
+        )
+
+    def process(
+        self, input_path, noise_path, M, alpha, beta, token=None, progress=None
+    ):
         """
         Performs spectral subtraction to remove noise from audio.
 
@@ -13,69 +224,372 @@ class NoiseCanceller:
             M: Window size (FFT size).
             alpha: Over-subtraction factor (controls how aggressively noise is removed).
             beta: Spectral floor (prevents magnitude from hitting absolute zero/artifacts).
+            token: Optional CancelToken (see core/jobs.py). It is checked between blocks
+                of PROCESS_BLOCK_FRAMES frames, and Cancelled is raised once it is set.
+            progress: Optional callable receiving the completed fraction (0..1).
 
         Returns:
             A dictionary containing raw audio arrays and frequency domain data (dB) for plotting.
+            The *_mag_db entries are DisplaySpectrogram objects of shape (bins, frames);
+            read a time frame with .column(index) or [:, index].
+            Without mono, the audio entries are (channels, samples) and the dB
+            spectrograms show the first channel.
         """
-        # 1. Load Data
-        # Read the input (noisy audio) and the noise profile (pure noise sample)
-        # Returns sample rate (rate) and normalized float32 audio data
-        rate, input_data = read_audio(input_path)
-        _, noise_data = read_audio(noise_path)
-
-        # 2. Setup STFT
-        # R is the hop size (overlap), set to 50% of the window size
-        R = M // 2
-        # Create a Hanning window to smooth segment edges and reduce spectral leakage
-        window = np.hanning(M)
-        # Calculate normalization factor to ensure correct amplitude scaling later
-        norm_factor = np.sum(window) / 2
-
-        # 3. Perform STFT
-        # Convert the time-domain input signal into the frequency domain (complex numbers)
-        f, t, input_stft = manual_stft(input_data, rate, window, M, R)
-        # Convert the noise signal to frequency domain to analyze its characteristics
-        _, _, noise_stft = manual_stft(noise_data, rate, window, M, R)
-
-        # 4. Spectral Subtraction Logic
-        # Calculate Magnitude of the Input Signal (|S|)
-        mag_input = np.abs(input_stft)
-
-        # Estimate the Noise Profile: Average the magnitude of the noise file across all time frames
-        # This assumes the noise is relatively stationary (constant) over time
-        mag_noise = np.mean(np.abs(noise_stft), axis=0, keepdims=True)
-
-        # Save the Phase of the original input. We subtract magnitudes but must keep original phase
-        # because the human ear is less sensitive to phase errors than magnitude errors.
-        phase_input = np.angle(input_stft)
-
-        # Subtract Noise:
-        # Formula: |Denoised| = |Input| - (alpha * |Noise|)
-        # np.maximum(..., ...) implements the "Spectral Floor":
-        # It ensures the result never drops below a small fraction (beta) of the original signal.
-        # This prevents negative magnitudes and reduces "musical noise" artifacts.
-        mag_denoised = np.maximum(beta * mag_input, mag_input - alpha * mag_noise)
-
-        # Reconstruct Complex STFT: Combine the new denoised magnitude with the original phase
-        denoised_stft = mag_denoised * np.exp(1j * phase_input)
-
-        # 5. ISTFT (Inverse Short-Time Fourier Transform)
-        # Convert the modified frequency domain signal back into a time-domain audio waveform
-        cleaned_audio = manual_istft(denoised_stft.T, rate, window, M, R)
-
-        # 6. Prepare Graph Data
-        # Convert magnitudes to Decibels (dB) for visualization (Logarithmic scale)
-        # 20 * log10(|Mag|) is the standard formula for amplitude to dB
-        # 1e-9 is added to prevent log(0) errors
+        profiler = StageProfiler(trace_memory=self.profile_memory)
+
+        # Tracing is process-wide, so it must stop even if a stage raises (a bad file,
+        # a channel mismatch or a cancelled job)
+        try:
+            # 1-3. Load and analyse both files (reused when only alpha/beta changed)
+            # Share of the progress taken by the analysis: none when it is reused
+            analysis_cached = self.has_analysis(input_path, noise_path, M)
+            analysis_end = 0.0 if analysis_cached else 0.5
+            analysis = self.analyse(
+                input_path, noise_path, M, profiler, token, progress, analysis_end
+            )
+            rate = analysis["sample_rate"]
+            window = analysis["window"]
+            R = analysis["R"]
+            norm_factor = analysis["norm_factor"]
+            input_stft = analysis["input_stft"]
+            n_frames = input_stft.shape[-2]
+            subtraction_end = (1 + analysis_end) / 2
+
+            # 4. Spectral Subtraction Logic
+            # Scale every bin of a copy of the input STFT by its gain; the phase is kept
+            # (the cached input STFT itself must stay untouched for the next re-filter)
+            with profiler.stage("subtraction"):
+                denoised_stft = input_stft.copy()
+                for first, stop in _frame_blocks(
+                    n_frames, token, progress, analysis_end, subtraction_end
+                ):
+                    apply_gain_mask(
+                        denoised_stft[..., first:stop, :],
+                        analysis["mag_noise"],
+                        alpha,
+                        beta,
+                    )
+
+            # 5. ISTFT (Inverse Short-Time Fourier Transform)
+            # Convert the modified frequency domain signal back into a time-domain audio
+            # waveform. The inverse FFTs run block by block (same steps as manual_istft),
+            # then all frames are overlap-added at once.
+            with profiler.stage("istft"):
+                time_frames = np.empty(
+                    denoised_stft.shape[:-1] + (M,), dtype=denoised_stft.real.dtype
+                )
+                for first, stop in _frame_blocks(
+                    n_frames, token, progress, subtraction_end, 1.0
+                ):
+                    time_frames[..., first:stop, :] = synthesize_frames(
+                        denoised_stft[..., first:stop, :], window, M
+                    )
+                del denoised_stft
+                cleaned_audio = overlap_add(time_frames, M - R)
+                normalize_overlap_add(cleaned_audio, window, M - R)
+
+            # 6. Prepare Graph Data
+            # Convert magnitudes to Decibels (dB) for visualization (Logarithmic scale)
+            # 20 * log10(|Mag|) is the standard formula for amplitude to dB
+            # 1e-9 is added to prevent log(0) errors
+            # The cleaned spectrum is derived column by column from the cached input STFT
+            # when the plot asks for it, so the denoised STFT can be freed after the ISTFT
+            with profiler.stage("db_conversion"):
+                cleaned_mag_db = _cleaned_display(
+                    analysis, alpha, beta, self.display_quantize
+                )
+        finally:
+            profiler.stop()
+
+        profile = profiler.report(analysis_cached=analysis_cached)
+        log_profile(profile)
+
         return {
             "sample_rate": rate,
-            "original_audio": input_data,
+            "original_audio": analysis["input_data"],
             "cleaned_audio": cleaned_audio,
-            "noise_audio": noise_data,
-            "stft_freq": f,
-            "stft_time": t,
-            "original_mag_db": 20 * np.log10(np.abs(input_stft.T) / norm_factor + 1e-9),
-            "cleaned_mag_db": 20
-            * np.log10(np.abs(denoised_stft.T) / norm_factor + 1e-9),
-            "noise_mag_db": 20 * np.log10(np.abs(mag_noise.T) / norm_factor + 1e-9),
+            "noise_audio": analysis["noise_data"],
+            "stft_freq": analysis["stft_freq"],
+            "stft_time": analysis["stft_time"],
+            "original_mag_db": analysis["original_mag_db"],
+            "cleaned_mag_db": cleaned_mag_db,
+            "noise_mag_db": analysis["noise_mag_db"],
+            "profile": profile,
         }
+
+    def preview(self, input_path, noise_path, M, alpha, beta, start_time, end_time):
+        """
+        Re-renders only the cleaned audio between start_time and end_time (seconds),
+        e.g. the few seconds around the playhead while alpha/beta are being tuned.
+
+        Only subtraction and ISTFT run, on the frames covering that range plus the
+        ceil(M / hop) - 1 earlier frames that overlap its first samples (see
+        render_frames()). The input STFT comes from the cached analysis, so this is
+        cheap once process() has run for the same files and M.
+
+        Returns:
+            A dictionary with "start_sample", "cleaned_audio" (the rendered samples,
+            identical to process()["cleaned_audio"][start_sample:start_sample + n]
+            for the same parameters) and "cleaned_mag_db" (a DisplaySpectrogram for
+            the whole file, converted lazily).
+        """
+        analysis = self.analyse(input_path, noise_path, M)
+        rate = analysis["sample_rate"]
+        # R is passed to the STFT as the overlap, so frames start every M - R samples
+        step = M - analysis["R"]
+        input_stft = analysis["input_stft"]
+        n_frames = input_stft.shape[-2]
+
+        # Frames owning the requested samples
+        first_frame = min(max(int(start_time * rate) // step, 0), max(n_frames - 1, 0))
+        end_frame = min(
+            max(-(-int(end_time * rate) // step), first_frame + 1), n_frames
+        )
+
+        start_sample, cleaned_audio = render_frames(
+            lambda start, end: input_stft[..., start:end, :].copy(),
+            first_frame,
+            end_frame,
+            n_frames,
+            analysis["mag_noise"],
+            M,
+            alpha,
+            beta,
+            analysis["window"],
+        )
+        return {
+            "start_sample": start_sample,
+            "cleaned_audio": cleaned_audio,
+            "cleaned_mag_db": _cleaned_display(analysis, alpha, beta),
+        }
+
+    def has_analysis(self, input_path, noise_path, M):
+        """Returns True if analyse() would reuse its stored result for these arguments."""
+        key = (_file_id(input_path), _file_id(noise_path), M)
+        with self._analysis_lock:
+            return self._analysis_key == key
+
+    def analyse(
+        self,
+        input_path,
+        noise_path,
+        M,
+        profiler=None,
+        token=None,
+        progress=None,
+        progress_end=1.0,
+    ):
+        """
+        Loads both files and computes everything that does not depend on alpha/beta.
+
+        The result is kept for the last (input file, noise file, M) combination, so
+        re-filtering with new alpha/beta only runs subtraction, ISTFT and dB conversion.
+        Files are identified by path, size and modification time.
+
+        Args:
+            profiler: Optional StageProfiler that receives the load/STFT/dB timings.
+            token, progress: Cancellation and progress as in process(); the input is
+                read in blocks of LOAD_BLOCK_SAMPLES samples and the STFT runs in
+                blocks of PROCESS_BLOCK_FRAMES frames, reporting 0..progress_end.
+
+        Returns:
+            A dictionary with the audio, complex input STFT, noise profile and their dB values.
+        """
+        if profiler is None:
+            profiler = StageProfiler(trace_memory=False)
+
+        key = (_file_id(input_path), _file_id(noise_path), M)
+        with self._analysis_lock:
+            if self._analysis_key == key:
+                return self._analysis
+
+            # 1. Load Data
+            # Read the input (noisy audio) and the noise profile (pure noise sample)
+            # Returns sample rate (rate) and normalized audio data, read in blocks so a
+            # cancelled job stops during a long load
+            with profiler.stage("load"):
+                rate, input_data = _load_audio(input_path, self.mono, self.dtype, token)
+                _, noise_data = _load_audio(noise_path, self.mono, np.float32, token)
+            if token is not None:
+                token.check()
+
+            # 2. Setup STFT
+            # R is the hop size (overlap), set to 50% of the window size
+            R = M // 2
+            # Create a Hanning window to smooth segment edges and reduce spectral leakage
+            # (its dtype sets the precision of every later stage)
+            window = hanning_window(M, self.precision)
+            # Calculate normalization factor to ensure correct amplitude scaling later
+            norm_factor = np.sum(window) / 2
+
+            # 3. Perform STFT
+            # Convert the time-domain input signal into the frequency domain (complex numbers)
+            # Each block is the STFT of the slice of the signal its frames cover, so the
+            # frames match a single manual_stft() call over the whole signal
+            with profiler.stage("stft_input"):
+                step = M - R
+                n_frames = max((input_data.shape[-1] - M) // step + 1, 0)
+                input_stft = np.empty(
+                    input_data.shape[:-1] + (n_frames, M // 2 + 1),
+                    dtype=np.result_type(self.dtype, np.complex64),
+                )
+                for first, stop in _frame_blocks(
+                    n_frames, token, progress, 0.0, progress_end
+                ):
+                    _, _, input_stft[..., first:stop, :] = manual_stft(
+                        input_data[..., first * step : (stop - 1) * step + M],
+                        rate,
+                        window,
+                        M,
+                        R,
+                    )
+                f = np.fft.rfftfreq(M, d=1 / rate)
+                t = (np.arange(n_frames) * step + M / 2) / rate
+
+            # Estimate the Noise Profile: Average the magnitude of the noise file across all time frames
+            # (cached by file content, so a reused noise recording is only analysed once)
+            with profiler.stage("stft_noise"):
+                mag_noise = self.noise_profile(noise_path, M)
+                if token is not None:
+                    # Hashing and analysing an uncached noise file can take a while
+                    token.check()
+                if mag_noise.ndim == 3 and mag_noise.shape[0] not in (
+                    1,
+                    input_data.shape[0],
+                ):
+                    raise ValueError(
+                        f"The noise file has {mag_noise.shape[0]} channels but the input "
+                        f"has {input_data.shape[0]}; use a mono noise file or one with "
+                        "the same number of channels"
+                    )
+
+            # dB spectrograms for the plot, converted lazily (see core/display.py)
+            # (only the first channel is shown for multichannel input)
+            with profiler.stage("db_conversion"):
+                display_stft, display_noise = _first_channel(input_stft, mag_noise)
+                original_mag_db = DisplaySpectrogram(
+                    display_stft, norm_factor, quantize=self.display_quantize
+                )
+                noise_mag_db = DisplaySpectrogram(display_noise, norm_factor)
+
+            self._analysis = {
+                "sample_rate": rate,
+                "input_data": input_data,
+                "noise_data": noise_data,
+                "window": window,
+                "R": R,
+                "norm_factor": norm_factor,
+                "stft_freq": f,
+                "stft_time": t,
+                "input_stft": input_stft,
+                "mag_noise": mag_noise,
+                "original_mag_db": original_mag_db,
+                "noise_mag_db": noise_mag_db,
+            }
+            self._analysis_key = key
+            return self._analysis
+
+    def process_blocks(self, blocks, noise_path, M, alpha, beta, rate=None):
+        """
+        Streaming version of process() that keeps memory bounded by the block size.
+
+        Args:
+            blocks: Iterable of 1-D float sample blocks (any length), e.g. from read_audio_blocks.
+            noise_path: Path to the noise profile file, or None to estimate the noise
+                from the stream itself with a NoiseTracker (see core/noise_tracker.py).
+            M, alpha, beta: Same as process().
+            rate: Sample rate of the blocks. Only used without a noise file, to size the
+                tracker's minimum-search window.
+
+        Yields:
+            Blocks of cleaned samples. With a noise file, concatenated, they are
+            sample-identical to process()["cleaned_audio"]. A sample is emitted as
+            soon as the last frame covering it has been processed, so the output lags
+            the input by at most M samples plus the buffering of one input block.
+        """
+        # Same analysis setup as the offline path
+        R = M // 2
+        window = hanning_window(M, self.precision)
+        # R is passed to the STFT as the overlap, so frames start every M - R samples
+        step = M - R
+
+        tracker = None
+        if noise_path is None:
+            # No noise file: follow the noise frame by frame instead
+            tracker = NoiseTracker(
+                M // 2 + 1,
+                min_window_frames(rate, step) if rate else 32,
+                self.dtype,
+            )
+        else:
+            mag_noise = self.noise_profile(noise_path, M)
+
+        # Number of previous frames that still overlap samples not yet emitted
+        carry_frames = -(-M // step) - 1
+
+        # Input samples from the start of the next frame onwards
+        pending = np.empty(0, dtype=self.dtype)
+        # Windowed time frames kept around for the next overlap-add
+        carry = np.empty((0, M), dtype=self.dtype)
+        # Absolute index of the next frame to be analysed
+        frame_index = 0
+        # Absolute index of the next output sample to emit
+        emitted = 0
+
+        for block in blocks:
+            pending = np.concatenate((pending, np.asarray(block, dtype=self.dtype)))
+            n_new = max((pending.size - M) // step + 1, 0)
+            if n_new == 0:
+                continue
+
+            # Analyse, denoise and resynthesize only the frames that are now complete
+            _, _, block_stft = manual_stft(pending, 1, window, M, R)
+            if tracker is None:
+                apply_gain_mask(block_stft, mag_noise, alpha, beta)
+            else:
+                # Each frame is cleaned with the estimate that includes it
+                for frame in block_stft[:, np.newaxis]:
+                    apply_gain_mask(frame, tracker.update(frame[0]), alpha, beta)
+            frames = synthesize_frames(block_stft, window, M)
+
+            # Overlap-add together with the carried frames so every sample up to the start
+            # of the next frame receives all of its contributions, in the same order as
+            # the offline path
+            stacked = np.concatenate((carry, frames))
+            first_sample = (frame_index - len(carry)) * step
+            output = overlap_add(stacked, step)
+            normalize_overlap_add(output, window, step)
+
+            frame_index += n_new
+            emit_end = frame_index * step
+            yield output[emitted - first_sample : emit_end - first_sample]
+            emitted = emit_end
+
+            # Keep only what the next block needs
+            carry = stacked[max(len(stacked) - carry_frames, 0) :]
+            pending = pending[n_new * step :]
+
+        # Flush the tail of the last frames once the input has ended
+        if frame_index > 0 and len(carry) > 0:
+            first_sample = (frame_index - len(carry)) * step
+            output = overlap_add(carry, step)
+            normalize_overlap_add(output, window, step)
+            yield output[emitted - first_sample :]
+
+    def process_stream(self, reader, writer, noise_path, M, alpha, beta, rate=None):
+        """
+        Runs process_blocks() from a reader into a writer.
+
+        Args:
+            reader: Iterable of input sample blocks, e.g. the generator from read_audio_blocks.
+            writer: Callable receiving each cleaned block, e.g. WavBlockWriter.write.
+            noise_path, M, alpha, beta, rate: Same as process_blocks().
+
+        Returns:
+            The number of cleaned samples written.
+        """
+        samples_written = 0
+        for cleaned in self.process_blocks(reader, noise_path, M, alpha, beta, rate):
+            writer(cleaned)
+            samples_written += cleaned.size
+        return samples_written
@@ -0,0 +1,96 @@
+"""
+Lightweight per-stage instrumentation for the processing pipeline.
+
+A StageProfiler records wall time, CPU time and allocated bytes for each named
+stage of a run:
+
+    profiler = StageProfiler()
+    with profiler.stage("stft"):
+        ...
+    profiler.report()  # -> dict that can be returned, logged or formatted
+"""
+
+from contextlib import contextmanager
+import json
+import logging
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+
+class StageProfiler:
+    """
+    Collects timings per stage. Stages with the same name are accumulated.
+
+    :param trace_memory: Measure the peak bytes allocated inside each stage using
+        tracemalloc. Skipped when tracemalloc is already running for someone else,
+        so outer measurements are not disturbed.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.stages = {}
+        self._start = time.perf_counter()
+        self._owns_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        if self._owns_tracing:
+            start_bytes, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        # CPU time of this thread only, since processing runs on a worker thread
+        start_cpu = time.thread_time()
+        start_wall = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start_wall
+            cpu = time.thread_time() - start_cpu
+            allocated = None
+            if self._owns_tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                allocated = peak - start_bytes
+
+            entry = self.stages.setdefault(name, {"wall": 0.0, "cpu": 0.0, "bytes": 0})
+            entry["wall"] += wall
+            entry["cpu"] += cpu
+            if allocated is None:
+                entry["bytes"] = None
+            elif entry["bytes"] is not None:
+                entry["bytes"] = max(entry["bytes"], allocated)
+
+    def stop(self):
+        """Stops memory tracing if this profiler started it."""
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def report(self, **extra):
+        """Returns the stages plus total wall time, and any extra fields, as a dict."""
+        self.stop()
+        return {
+            "stages": self.stages,
+            "total_wall": time.perf_counter() - self._start,
+            **extra,
+        }
+
+
+def log_profile(profile, label="process"):
+    """Logs a profile as one structured JSON line at INFO level."""
+    logger.info(json.dumps({"event": f"{label}_profile", **profile}))
+
+
+def format_profile(profile):
+    """Returns a compact one-line summary, e.g. 'Total 812 ms | stft 300 | istft 210 | ...'."""
+    if not profile:
+        return ""
+
+    # Slowest stages first, since that is what you look at when diagnosing
+    stages = sorted(profile["stages"].items(), key=lambda item: -item[1]["wall"])
+    parts = [f"Total {profile['total_wall'] * 1000:.0f} ms"]
+    parts += [f"{name} {entry['wall'] * 1000:.0f}" for name, entry in stages]
+    if profile.get("analysis_cached"):
+        parts.append("(analysis cached)")
+    return " | ".join(parts)
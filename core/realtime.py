@@ -0,0 +1,335 @@
+"""
+Live (real-time) noise cancelling.
+
+Runs the spectral subtraction from core/processing.py one hop at a time inside
+an audio callback. All buffers are allocated up front so the callback itself
+does not allocate. The audio device is hidden behind a small backend interface
+so the same code can be driven by sounddevice or by a file-backed fake device.
+
+Run a live session from the project root:
+    python -m core.realtime path/to/noise.wav --M 256
+
+or, without a noise recording, with the noise estimated on the fly:
+    python -m core.realtime --rate 44100 --M 256
+"""
+
+import argparse
+import time
+import numpy as np
+from .audio_utils import read_audio, inverse_window_sum
+from .noise_tracker import NoiseTracker, min_window_frames
+from .processing import estimate_noise_profile
+
+
+class RealtimeDenoiser:
+    """
+    Frame-by-frame spectral subtraction suitable for an audio callback.
+
+    Each callback must deliver exactly `hop` samples. The output is delayed by
+    `algorithmic_latency` seconds relative to the input.
+
+    Pass mag_noise=None to estimate the noise from the input itself with a
+    NoiseTracker instead of using a fixed profile.
+    """
+
+    def __init__(self, mag_noise, rate, M, alpha, beta):
+        self.rate = rate
+        self.M = M
+        self.alpha = alpha
+        self.beta = beta
+
+        # Same framing as the offline path: R is the overlap, frames start every M - R samples
+        R = M // 2
+        self.hop = M - R
+        self.window = np.hanning(M)
+
+        # Synthesis window divided by the steady-state sum of squared windows, so the
+        # overlap-added output has the same amplitude as the offline ISTFT
+        frames_per_window = -(-M // self.hop)
+        inverse = inverse_window_sum(self.window, self.hop, 2 * frames_per_window - 1)
+        interior = (frames_per_window - 1) * self.hop
+        self.synthesis_window = self.window * inverse[interior : interior + M]
+
+        bins = M // 2 + 1
+        if mag_noise is None:
+            # Updated every hop from the tracker's estimate
+            self.tracker = NoiseTracker(bins, min_window_frames(rate, self.hop))
+            self.noise_scaled = np.zeros(bins)
+        else:
+            # alpha * |Noise| is constant, so fold alpha in once
+            self.tracker = None
+            self.noise_scaled = alpha * np.ravel(mag_noise)
+
+        # Preallocated working buffers (swapped instead of shifted to avoid temporaries)
+        self._frame = np.zeros(M)
+        self._frame_next = np.zeros(M)
+        self._windowed = np.zeros(M)
+        self._spectrum = np.zeros(bins, dtype=np.complex128)
+        self._magnitude = np.zeros(bins)
+        self._gain = np.zeros(bins)
+        self._time_frame = np.zeros(M)
+        self._accumulator = np.zeros(M)
+        self._accumulator_next = np.zeros(M)
+
+        # Instrumentation
+        self.callbacks = 0
+        self.xruns = 0
+        self.late_callbacks = 0
+        self.total_callback_time = 0.0
+        self.max_callback_time = 0.0
+
+    @classmethod
+    def from_noise_file(cls, noise_path, M, alpha, beta):
+        """Builds a denoiser using the averaged noise profile of a WAV file."""
+        rate, noise_data = read_audio(noise_path)
+        window = np.hanning(M)
+        mag_noise = estimate_noise_profile(noise_data, window, M, M // 2)
+        return cls(mag_noise, rate, M, alpha, beta)
+
+    @property
+    def algorithmic_latency(self):
+        # A sample leaves the overlap-add once all frames covering it are done,
+        # which is M - hop samples after it arrived
+        return (self.M - self.hop) / self.rate
+
+    def process_hop(self, samples, out):
+        """Pushes `hop` input samples through the denoiser and writes `hop` cleaned samples to out."""
+        M, hop = self.M, self.hop
+
+        # 1. Slide the analysis frame along by one hop
+        self._frame_next[: M - hop] = self._frame[hop:]
+        self._frame_next[M - hop :] = samples
+        self._frame, self._frame_next = self._frame_next, self._frame
+
+        # 2. STFT of the current frame
+        np.multiply(self._frame, self.window, out=self._windowed)
+        np.fft.rfft(self._windowed, out=self._spectrum)
+
+        # Without a noise file, update the noise estimate with this frame first
+        if self.tracker is not None:
+            np.multiply(
+                self.tracker.update(self._spectrum), self.alpha, out=self.noise_scaled
+            )
+
+        # 3. Spectral subtraction as a real gain per bin:
+        # max(beta * |S|, |S| - alpha * |N|) / |S| == max(beta, 1 - alpha * |N| / |S|)
+        np.abs(self._spectrum, out=self._magnitude)
+        np.maximum(self._magnitude, 1e-12, out=self._magnitude)
+        np.divide(self.noise_scaled, self._magnitude, out=self._gain)
+        np.subtract(1.0, self._gain, out=self._gain)
+        np.maximum(self._gain, self.beta, out=self._gain)
+        np.multiply(self._spectrum, self._gain, out=self._spectrum)
+
+        # 4. ISTFT of the frame and overlap-add
+        np.fft.irfft(self._spectrum, n=M, out=self._time_frame)
+        self._time_frame *= self.synthesis_window
+        self._accumulator += self._time_frame
+
+        # 5. The first hop of the accumulator is now complete
+        out[:] = self._accumulator[:hop]
+        self._accumulator_next[: M - hop] = self._accumulator[hop:]
+        self._accumulator_next[M - hop :] = 0.0
+        self._accumulator, self._accumulator_next = (
+            self._accumulator_next,
+            self._accumulator,
+        )
+
+    def callback(self, indata, outdata, frames, time_info, status):
+        """sounddevice-compatible duplex callback (mono)."""
+        start = time.perf_counter()
+
+        # Any status flag (input overflow, output underflow, ...) is an xrun
+        if status:
+            self.xruns += 1
+
+        self.process_hop(indata[:, 0], outdata[:, 0])
+
+        # Record how long the callback took compared to the time budget of one block
+        elapsed = time.perf_counter() - start
+        self.callbacks += 1
+        self.total_callback_time += elapsed
+        if elapsed > self.max_callback_time:
+            self.max_callback_time = elapsed
+        if elapsed > frames / self.rate:
+            self.late_callbacks += 1
+
+    def stats(self, device_latency=0.0):
+        """Returns latency and xrun counters measured so far."""
+        mean_callback = (
+            self.total_callback_time / self.callbacks if self.callbacks else 0.0
+        )
+        return {
+            "algorithmic_latency": self.algorithmic_latency,
+            "device_latency": device_latency,
+            "total_latency": self.algorithmic_latency + device_latency,
+            "callbacks": self.callbacks,
+            "mean_callback_time": mean_callback,
+            "max_callback_time": self.max_callback_time,
+            "callback_budget": self.hop / self.rate,
+            "late_callbacks": self.late_callbacks,
+            "xruns": self.xruns,
+        }
+
+
+class SoundDeviceBackend:
+    """Runs a callback on a real duplex audio device through sounddevice."""
+
+    def __init__(self, device=None):
+        self.device = device
+        self.stream = None
+
+    def start(self, rate, blocksize, callback):
+        # Imported here so the core package works on machines without an audio stack
+        import sounddevice as sd
+
+        self.stream = sd.Stream(
+            samplerate=rate,
+            blocksize=blocksize,
+            channels=1,
+            dtype="float64",
+            device=self.device,
+            callback=callback,
+        )
+        self.stream.start()
+
+    def wait(self, duration=None):
+        # The device runs on its own thread; block here until time is up or Ctrl+C
+        if duration is None:
+            while True:
+                time.sleep(0.5)
+        time.sleep(duration)
+
+    def stop(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+    @property
+    def latency(self):
+        if self.stream is None:
+            return 0.0
+        # Stream.latency is an (input, output) pair for duplex streams
+        return float(sum(self.stream.latency))
+
+
+class _FakeStatus:
+    def __init__(self, xrun=False):
+        self.xrun = xrun
+
+    def __bool__(self):
+        return self.xrun
+
+
+class FileStreamBackend:
+    """
+    Fake duplex device that feeds a recorded signal to the callback block by block
+    and records what the callback writes. Useful for testing without hardware.
+
+    :param input_data: 1-D float array, or a path to a WAV file.
+    :param realtime: If True, sleep between blocks to mimic a real device clock.
+    :param xrun_blocks: Block indices at which to report an xrun status.
+    """
+
+    def __init__(self, input_data, realtime=False, xrun_blocks=()):
+        if isinstance(input_data, str):
+            self.rate, input_data = read_audio(input_data)
+        else:
+            self.rate = None
+        self.input_data = np.asarray(input_data, dtype=np.float64)
+        self.realtime = realtime
+        self.xrun_blocks = set(xrun_blocks)
+        self.output_data = None
+        self.latency = 0.0
+
+    def start(self, rate, blocksize, callback):
+        # Only whole blocks are delivered, like a device running for a fixed time
+        n_blocks = self.input_data.size // blocksize
+        self.output_data = np.zeros(n_blocks * blocksize)
+
+        indata = np.zeros((blocksize, 1))
+        outdata = np.zeros((blocksize, 1))
+        ok, xrun = _FakeStatus(False), _FakeStatus(True)
+
+        for i in range(n_blocks):
+            start = i * blocksize
+            indata[:, 0] = self.input_data[start : start + blocksize]
+            callback(
+                indata, outdata, blocksize, None, xrun if i in self.xrun_blocks else ok
+            )
+            self.output_data[start : start + blocksize] = outdata[:, 0]
+            if self.realtime:
+                time.sleep(blocksize / rate)
+
+    def wait(self, duration=None):
+        # start() already pushed the whole signal through the callback
+        pass
+
+    def stop(self):
+        pass
+
+
+def run_live(denoiser, backend, duration=None):
+    """
+    Starts the backend with the denoiser callback and returns its stats when done.
+
+    :param duration: Seconds to run for. If None, runs until interrupted (Ctrl+C).
+    """
+    backend.start(denoiser.rate, denoiser.hop, denoiser.callback)
+    try:
+        backend.wait(duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        latency = backend.latency
+        backend.stop()
+
+    return denoiser.stats(device_latency=latency)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Live noise cancelling from the default audio device."
+    )
+    parser.add_argument(
+        "noise_path",
+        nargs="?",
+        default=None,
+        help="WAV file containing a sample of the noise (default: estimate it live)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=int,
+        default=44100,
+        help="Sample rate when no noise file is given",
+    )
+    parser.add_argument("--M", type=int, default=256, help="Window size (FFT size)")
+    parser.add_argument(
+        "--alpha", type=float, default=1.05, help="Over-subtraction factor"
+    )
+    parser.add_argument("--beta", type=float, default=0.001, help="Spectral floor")
+    parser.add_argument(
+        "--device", default=None, help="sounddevice device name or index"
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="Seconds to run (default: until Ctrl+C)",
+    )
+    args = parser.parse_args()
+
+    if args.noise_path is None:
+        denoiser = RealtimeDenoiser(None, args.rate, args.M, args.alpha, args.beta)
+    else:
+        denoiser = RealtimeDenoiser.from_noise_file(
+            args.noise_path, args.M, args.alpha, args.beta
+        )
+    stats = run_live(denoiser, SoundDeviceBackend(args.device), args.duration)
+
+    for key, value in stats.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
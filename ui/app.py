@@ -1,12 +1,17 @@
 import customtkinter as ctk
+import importlib
 import threading
 import os
 from tkinter import messagebox
-from core.processing import NoiseCanceller
-from core.audio_utils import save_audio
+from core.jobs import JobScheduler
+from core.profiling import format_profile
 from ui.theme import *
 from ui.pages.file_selection import FileSelectionPage
-from ui.pages.output_editor import OutputEditorPage
+
+# Pages that are only needed after processing, as page name -> module. Their
+# modules pull in matplotlib, so they are imported and built on first use rather
+# than before the file-selection window can appear.
+LAZY_PAGES = {"OutputEditorPage": "ui.pages.output_editor"}
 
 
 class App(ctk.CTk):
@@ -20,7 +25,15 @@ class App(ctk.CTk):
         self.noise_path = None
         self.processing_results = None
         self.current_parameters = {}
-        self.processor = NoiseCanceller()
+        # Compact per-stage timing of the last processing run
+        self.profile_summary = ""
+        # True while a save runs in the background
+        self.saving = False
+        # NoiseCanceller, created by the first processing run (see get_processor)
+        self.processor = None
+        self._processor_lock = threading.Lock()
+        # Runs one processing job at a time; a new request cancels the running one
+        self.scheduler = JobScheduler(post=lambda callback: self.after(0, callback))
 
         # Pages container
         self.container = ctk.CTkFrame(self)
@@ -33,15 +46,41 @@ class App(ctk.CTk):
         self.show_page("FileSelectionPage")
 
     def init_pages(self):
-        # We inject 'self' as the controller
-        for PageClass in [FileSelectionPage, OutputEditorPage]:
-            page_name = PageClass.__name__
-            page = PageClass(parent=self.container, controller=self)
-            self.pages[page_name] = page
-            page.grid(row=0, column=0, sticky="nsew")
+        # We inject 'self' as the controller. Only the first page is built here;
+        # the others are built by get_page() when they are first shown.
+        for PageClass in [FileSelectionPage]:
+            self.add_page(PageClass)
+
+    def add_page(self, PageClass):
+        page_name = PageClass.__name__
+        page = PageClass(parent=self.container, controller=self)
+        self.pages[page_name] = page
+        page.grid(row=0, column=0, sticky="nsew")
+        return page
+
+    def get_page(self, page_name):
+        """Returns the page called page_name, importing and building it if needed."""
+        page = self.pages.get(page_name)
+        if page is None:
+            module = importlib.import_module(LAZY_PAGES[page_name])
+            page = self.add_page(getattr(module, page_name))
+        return page
+
+    def get_processor(self):
+        """
+        Returns the shared NoiseCanceller, importing the DSP modules (scipy, numba)
+        on first use. Called from the processing thread, so that import never blocks
+        the UI.
+        """
+        with self._processor_lock:
+            if self.processor is None:
+                from core.processing import NoiseCanceller
+
+                self.processor = NoiseCanceller()
+            return self.processor
 
     def show_page(self, page_name):
-        page = self.pages[page_name]
+        page = self.get_page(page_name)
         if hasattr(page, "on_show"):
             page.on_show()
         page.tkraise()
@@ -50,37 +89,77 @@ class App(ctk.CTk):
         self.input_path = input_p
         self.noise_path = noise_p
 
-    def run_processing(self, M, alpha, beta):
-        """Runs processing in a separate thread"""
+    def run_processing(self, M, alpha, beta, then=None):
+        """
+        Processes the selected files on the scheduler's worker thread. A job that is
+        still running for older parameters is cancelled, and clicks in quick
+        succession only process the last parameters.
+
+        :param then: Optional function called on the UI thread once the results are
+            shown, e.g. to save them.
+        """
 
         self.current_parameters = {"M": M, "alpha": alpha, "beta": beta}
 
         # Show loading state if you have a spinner, or disable buttons
         self.configure(cursor="watch")
 
-        def task():
-            try:
-                data = self.processor.process(
-                    self.input_path, self.noise_path, M, alpha, beta
-                )
-                self.after(0, lambda: self.on_processing_success(data))
-            except Exception as e:
-                err_msg = str(e)
-                self.after(0, lambda: self.on_processing_error(err_msg))
+        input_path = self.input_path
+        noise_path = self.noise_path
 
-        threading.Thread(target=task, daemon=True).start()
+        def work(token, progress):
+            data = self.get_processor().process(
+                input_path, noise_path, M, alpha, beta, token=token, progress=progress
+            )
+            # Import the result page's modules here too, so building the page
+            # on the UI thread only has to create its widgets
+            for module in LAZY_PAGES.values():
+                importlib.import_module(module)
+            return data
+
+        self.scheduler.submit(
+            work,
+            on_success=lambda data: self.on_processing_success(data, then),
+            on_error=lambda e: self.on_processing_error(str(e)),
+            on_progress=self.on_processing_progress,
+        )
+
+    def cancel_processing(self):
+        """Abandons any pending or running processing job."""
+        self.scheduler.cancel()
+        self.configure(cursor="")
+        self._notify_pages("on_processing_finished")
 
-    def on_processing_success(self, data):
+    def _notify_pages(self, method, *args):
+        # Only pages that have been built, and that care, are told
+        for page in self.pages.values():
+            if hasattr(page, method):
+                getattr(page, method)(*args)
+
+    def on_processing_progress(self, fraction):
+        self._notify_pages("on_processing_progress", fraction)
+
+    def on_processing_success(self, data, then=None):
         self.configure(cursor="")
+        self._notify_pages("on_processing_finished")
         self.processing_results = data
+        self.profile_summary = format_profile(data.get("profile"))
         self.show_page("OutputEditorPage")
+        if then is not None:
+            then()
 
     def on_processing_error(self, error_msg):
         self.configure(cursor="")
+        self._notify_pages("on_processing_finished")
         messagebox.showerror("Error", error_msg)
 
-    def save_output(self):
-        if not self.processing_results:
+    def save_output(self, sample_format="int16"):
+        """
+        Saves the cleaned audio on a background thread so the UI stays responsive.
+
+        :param sample_format: "int16", "int24" or "float32" (see core.audio_utils.SAMPLE_FORMATS).
+        """
+        if not self.processing_results or self.saving:
             return
 
         # Save to Downloads
@@ -88,15 +167,37 @@ class App(ctk.CTk):
         filename = f"cleaned_{os.path.basename(self.input_path)}"
         path = os.path.join(downloads, filename)
 
-        try:
-            save_audio(
-                path,
-                self.processing_results["sample_rate"],
-                self.processing_results["cleaned_audio"],
-            )
+        # Keep a reference to this result; re-filtering replaces processing_results
+        # but never modifies the arrays being written
+        rate = self.processing_results["sample_rate"]
+        data = self.processing_results["cleaned_audio"]
+        page = self.get_page("OutputEditorPage")
+
+        self.saving = True
+        page.on_save_progress(0.0)
+
+        def report(fraction):
+            self.after(0, lambda: page.on_save_progress(fraction))
+
+        def task():
+            try:
+                from core.audio_utils import save_audio
+
+                save_audio(path, rate, data, sample_format, progress=report)
+                self.after(0, lambda: self.on_save_finished(path, None))
+            except Exception as e:
+                err_msg = str(e)
+                self.after(0, lambda: self.on_save_finished(path, err_msg))
+
+        threading.Thread(target=task, daemon=True).start()
+
+    def on_save_finished(self, path, error_msg):
+        self.saving = False
+        self.get_page("OutputEditorPage").on_save_finished()
+        if error_msg is None:
             messagebox.showinfo("Saved", f"File saved to:\n{path}")
-        except Exception as e:
-            messagebox.showerror("Save Error", str(e))
+        else:
+            messagebox.showerror("Save Error", error_msg)
 
 
 if __name__ == "__main__":
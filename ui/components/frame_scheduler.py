@@ -0,0 +1,113 @@
+"""
+Frame pacing and jank metrics for after()-driven animations.
+
+The spectrum animation runs on the Tk main thread, which it shares with every
+other UI event and, through the GIL, with the audio callback. FrameScheduler
+measures how long each frame takes to render and stretches the interval between
+frames so rendering never takes more than a fixed share of the time. On a slow
+machine the plot then shows fewer, still up-to-date frames, and the intermediate
+ones are skipped instead of queueing up behind each other.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+import time
+import numpy as np
+
+
+class FrameScheduler:
+    """
+    Adaptive frame budget plus FPS, dropped-frame and frame-time statistics.
+
+    :param target_fps: Frame rate to aim for when rendering is fast enough.
+    :param max_busy: Largest share of the main thread spent rendering (0..1).
+    :param history: Number of recent frames kept for the percentiles.
+    """
+
+    def __init__(self, target_fps=30, max_busy=0.5, history=240):
+        self.target_interval = 1.0 / target_fps
+        self.max_busy = max_busy
+        self._frame_times = deque(maxlen=history)
+        self._render_starts = deque(maxlen=history)
+        self.reset()
+
+    def reset(self):
+        """Clears the statistics, e.g. when playback starts."""
+        self._frame_times.clear()
+        self._render_starts.clear()
+        self._average_render = 0.0
+        self._last_tick = None
+        self.rendered = 0
+        self.dropped = 0
+        # True from the end of a render until Tk has been idle once, i.e. until the
+        # frame has reached the screen
+        self.pending = False
+
+    @property
+    def interval(self):
+        """Current time between frames in seconds (the adaptive frame budget)."""
+        return max(self.target_interval, self._average_render / self.max_busy)
+
+    def next_delay_ms(self):
+        """Delay to pass to after() for the next frame."""
+        return max(1, int(round(self.interval * 1000)))
+
+    def tick(self):
+        """
+        Called at the start of every animation tick. Counts the frames the target
+        rate would have shown since the previous tick but were skipped.
+
+        Returns:
+            False if the previous frame has not reached the screen yet, in which case
+            this tick should not render.
+        """
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            missed = int((now - self._last_tick) / self.target_interval) - 1
+            if missed > 0:
+                self.dropped += missed
+        self._last_tick = now
+
+        if self.pending:
+            self.dropped += 1
+            return False
+        return True
+
+    @contextmanager
+    def frame(self):
+        """Times one rendered frame."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._frame_times.append(elapsed)
+            self._render_starts.append(start)
+            self.rendered += 1
+            # Exponential average so one slow frame does not halve the frame rate
+            if self._average_render == 0.0:
+                self._average_render = elapsed
+            else:
+                self._average_render += 0.2 * (elapsed - self._average_render)
+
+    def stats(self):
+        """Returns rendered FPS, dropped frames and p50/p99 frame time (ms) of recent frames."""
+        fps = 0.0
+        if len(self._render_starts) > 1:
+            span = self._render_starts[-1] - self._render_starts[0]
+            if span > 0:
+                fps = (len(self._render_starts) - 1) / span
+
+        if self._frame_times:
+            p50, p99 = np.percentile(np.array(self._frame_times) * 1000, [50, 99])
+        else:
+            p50 = p99 = 0.0
+
+        return {
+            "fps": fps,
+            "rendered": self.rendered,
+            "dropped": self.dropped,
+            "frame_ms_p50": float(p50),
+            "frame_ms_p99": float(p99),
+            "interval_ms": self.interval * 1000,
+        }
@@ -7,11 +7,8 @@ Provides functions for displaying the graph.
 
 from ui.theme import *
 import numpy as np
-from scipy.io import wavfile
-from scipy.fft import rfft, rfftfreq
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib import pyplot as plt
 from matplotlib import ticker
 import customtkinter as ctk
 
@@ -26,8 +23,10 @@ def create_live_freq_domain_graphs(master, stft_freq):
     """
     try:
         # 1. Initialize Figure
-        # Create a single subplot with specific size (7x6 inches)
-        fig, ax = plt.subplots(1, 1, figsize=(7, 6))
+        # Create a single subplot with specific size (7x6 inches). A bare Figure
+        # avoids importing pyplot and its global figure manager
+        fig = Figure(figsize=(7, 6))
+        ax = fig.add_subplot(111)
         # Set the background color of the figure to match the UI theme
         fig.patch.set_facecolor(COLOR_BACKGROUND)
         # Adjust spacing to prevent labels from being cut off
@@ -1,11 +1,52 @@
 import customtkinter as ctk
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
 from matplotlib import ticker
 import numpy as np
 from ui.theme import *
 
+# Maximum number of points drawn per line, whatever the FFT size
+DISPLAY_POINTS = 300
+
+
+class LogBinPlan:
+    """
+    Precomputed reduction of linear rFFT bins to log-spaced display points.
+
+    Low frequencies, where linear bins are already sparse on a log axis, keep one
+    point per bin; higher bins are grouped so every group spans about the same
+    width on screen. Built once per frequency axis, then reduce() is a single
+    vectorized call per line.
+
+    :param frequency_data: Frequencies of the rFFT bins (Hz), increasing.
+    :param max_points: Upper bound on the number of display points.
+    :param mode: "max" keeps peaks visible, "mean" averages each group.
+    """
+
+    def __init__(self, frequency_data, max_points=DISPLAY_POINTS, mode="max"):
+        freqs = np.asarray(frequency_data, dtype=float)
+        self.mode = mode
+
+        # The DC bin (0 Hz) cannot be shown on a log axis
+        first = 1 if freqs.size > 1 and freqs[0] <= 0 else 0
+
+        # Group start indices: the first bin at or above each log-spaced edge.
+        # Duplicates (several edges inside one bin) collapse into one group.
+        edges = np.geomspace(freqs[first], freqs[-1], max_points + 1)[:-1]
+        starts = np.searchsorted(freqs, edges, side="left")
+        self.starts = np.unique(np.maximum(starts, first))
+
+        # Plot each group at the mean frequency of the bins it contains
+        counts = np.diff(np.append(self.starts, freqs.size))
+        self.x = np.add.reduceat(freqs, self.starts) / counts
+        self._counts = counts
+
+    def reduce(self, values):
+        """Reduces one column of per-bin values to len(self.x) display points."""
+        if self.mode == "mean":
+            return np.add.reduceat(values, self.starts) / self._counts
+        return np.maximum.reduceat(values, self.starts)
+
 
 class SpectrumPlot(ctk.CTkFrame):
     def __init__(self, master, **kwargs):
@@ -35,6 +76,8 @@ class SpectrumPlot(ctk.CTkFrame):
         self.lines = {}
         # Variable to store the static background pixels for "blitting" optimization
         self.bg_cache = None
+        # Log-frequency reduction of the bins, rebuilt when the frequency axis changes
+        self.bin_plan = None
 
     def setup_axis(self):
         # Configure titles and labels with theme-appropriate colors
@@ -75,20 +118,24 @@ class SpectrumPlot(ctk.CTkFrame):
             self.lines = {}
 
         # 2. Create Dummy Data
+        # Reduce the linear FFT bins to a few hundred log-spaced points, so drawing
+        # stays cheap however large M is
+        self.bin_plan = LogBinPlan(frequency_data)
+        display_freqs = self.bin_plan.x
         # Initialize lines with -100dB (silence) so they are invisible/at bottom initially
-        dummy_y = np.full_like(frequency_data, -100)
+        dummy_y = np.full_like(display_freqs, -100)
 
         # 3. Plot Lines
         # Plot the three distinct lines and store their references in the dictionary
         # The trailing comma (line,) unpacks the list returned by plot()
         (self.lines["original"],) = self.ax.plot(
-            frequency_data, dummy_y, color=COLOR_GRAPH, label="Original"
+            display_freqs, dummy_y, color=COLOR_GRAPH, label="Original"
         )
         (self.lines["cleaned"],) = self.ax.plot(
-            frequency_data, dummy_y, color=COLOR_ALT_GRAPH, label="Cleaned"
+            display_freqs, dummy_y, color=COLOR_ALT_GRAPH, label="Cleaned"
         )
         (self.lines["noise"],) = self.ax.plot(
-            frequency_data, dummy_y, color=COLOR_NOISE_GRAPH, label="Noise"
+            display_freqs, dummy_y, color=COLOR_NOISE_GRAPH, label="Noise"
         )
 
         # Show legend and perform the initial draw
@@ -115,10 +162,11 @@ class SpectrumPlot(ctk.CTkFrame):
         self.canvas.restore_region(self.bg_cache)
 
         # 2. Update Data
-        # Update the Y-values of the lines with the new decibel data
-        self.lines["original"].set_ydata(original_db)
-        self.lines["cleaned"].set_ydata(cleaned_db)
-        self.lines["noise"].set_ydata(noise_db)
+        # Update the Y-values of the lines with the new decibel data,
+        # pooled into the log-spaced display points
+        self.lines["original"].set_ydata(self.bin_plan.reduce(original_db))
+        self.lines["cleaned"].set_ydata(self.bin_plan.reduce(cleaned_db))
+        self.lines["noise"].set_ydata(self.bin_plan.reduce(noise_db))
 
         # 3. Redraw Artists
         # Efficiently redraw only the requested line elements
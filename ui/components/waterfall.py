@@ -0,0 +1,194 @@
+"""
+Scrolling spectrogram ("waterfall") that follows playback.
+
+Redrawing a full imshow() every frame is far too slow, so the image lives in a
+fixed-size uint8 RGBA ring buffer. Each new STFT column is reduced to the same
+log-spaced points as the spectrum plot, mapped to colours through a 256-entry
+lookup table once, and written into the ring in place. Every column is stored
+twice, at i and i + width, so the newest `width` columns are always one
+contiguous slice of the buffer and scrolling never copies the image. The plot
+then blits that slice over a cached background, like SpectrumPlot.
+"""
+
+import customtkinter as ctk
+from matplotlib import colormaps, ticker
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+import numpy as np
+from core.display import DB_MIN, DB_MAX
+from ui.components.spectrum_plot import LogBinPlan
+from ui.theme import *
+
+# Number of STFT frames visible at once
+HISTORY_COLUMNS = 300
+COLORMAP = "magma"
+
+
+def colormap_lut(name=COLORMAP):
+    """Returns the colormap as a (256, 4) uint8 RGBA table indexed by 8-bit level."""
+    return colormaps[name](np.linspace(0, 1, 256), bytes=True)
+
+
+class WaterfallBuffer:
+    """
+    Ring buffer of RGBA image columns.
+
+    :param rows: Pixels per column (display frequency points).
+    :param width: Number of columns kept.
+    :param lut: (256, 4) uint8 colour table, see colormap_lut().
+    """
+
+    def __init__(self, rows, width, lut):
+        self.rows = rows
+        self.width = width
+        self.lut = lut
+        self._pixels = np.empty((rows, 2 * width, 4), dtype=np.uint8)
+        # Scratch buffers for one column
+        self._levels = np.empty(rows, dtype=np.float32)
+        self._indices = np.empty(rows, dtype=np.uint8)
+        self.clear()
+
+    def clear(self):
+        """Fills the image with the colour of silence."""
+        self._pixels[:] = self.lut[0]
+        # Index of the next column to write
+        self._head = 0
+
+    def push(self, db):
+        """Appends one column of dB values (length rows), clipped to DB_MIN..DB_MAX."""
+        # Quantize to the 256 levels of the colour table
+        levels = self._levels
+        np.clip(db, DB_MIN, DB_MAX, out=levels)
+        levels -= DB_MIN
+        levels *= 255 / (DB_MAX - DB_MIN)
+        self._indices[:] = levels
+
+        colors = self.lut[self._indices]
+        self._pixels[:, self._head] = colors
+        self._pixels[:, self._head + self.width] = colors
+        self._head = (self._head + 1) % self.width
+
+    def image(self):
+        """The (rows, width, 4) image, oldest column first. A view, not a copy."""
+        return self._pixels[:, self._head : self._head + self.width]
+
+
+class WaterfallPlot(ctk.CTkFrame):
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+
+        # 1. Create Matplotlib Figure
+        self.fig = Figure(figsize=(7, 2.5), dpi=100)
+        self.fig.patch.set_facecolor(COLOR_BACKGROUND)
+        self.ax = self.fig.add_subplot(111)
+        self.ax.set_ylabel("Frequency (Hz)", color=COLOR_TEXT)
+        self.ax.set_xlabel("Time (s)", color=COLOR_TEXT)
+        self.ax.tick_params(colors=COLOR_TEXT)
+
+        # 2. Create Canvas
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        # A full redraw (e.g. after a resize) invalidates the cached background
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+
+        # 3. Initialization State
+        self.lut = colormap_lut()
+        self.image = None
+        self.buffer = None
+        self.bin_plan = None
+        self.bg_cache = None
+        # DisplaySpectrogram the columns are read from
+        self.spectrogram = None
+        self.constant = False
+        # Frame index of the newest column in the buffer
+        self.last_index = None
+
+    def init_plot(self, frequency_data, frame_step):
+        """
+        Sets up the axes for a new result.
+
+        :param frequency_data: Frequencies of the rFFT bins (Hz).
+        :param frame_step: Seconds between STFT frames, for the time axis.
+        """
+        if self.image is not None:
+            self.image.remove()
+
+        # Same log-spaced frequency points as the spectrum plot, one image row each
+        self.bin_plan = LogBinPlan(frequency_data)
+        rows = len(self.bin_plan.x)
+        self.buffer = WaterfallBuffer(rows, HISTORY_COLUMNS, self.lut)
+        self.last_index = None
+
+        # Animated, so full redraws leave it out of the cached background
+        self.image = self.ax.imshow(
+            self.buffer.image(),
+            origin="lower",
+            aspect="auto",
+            interpolation="nearest",
+            extent=(-HISTORY_COLUMNS * frame_step, 0, -0.5, rows - 0.5),
+            animated=True,
+        )
+
+        # Rows are log-spaced, so label them with the frequency they show
+        display_freqs = self.bin_plan.x
+
+        def freq_formatter(y, pos):
+            row = int(round(y))
+            if row < 0 or row >= len(display_freqs):
+                return ""
+            freq = display_freqs[row]
+            if freq >= 1000:
+                return f"{freq / 1000:.1f}kHz"
+            return f"{int(freq)}Hz"
+
+        self.ax.yaxis.set_major_formatter(ticker.FuncFormatter(freq_formatter))
+        self.canvas.draw()
+
+    def on_draw(self, event):
+        # Cache everything but the image, then put the image back on top
+        self.bg_cache = self.canvas.copy_from_bbox(self.ax.bbox)
+        if self.image is not None:
+            self.ax.draw_artist(self.image)
+
+    def set_source(self, spectrogram, constant=False):
+        """
+        Shows another signal.
+
+        :param spectrogram: DisplaySpectrogram to read columns from.
+        :param constant: True for a single-column spectrogram (the noise profile),
+            which is repeated at every frame.
+        """
+        self.spectrogram = spectrogram
+        self.constant = constant
+        self.last_index = None
+
+    def _push_frame(self, index):
+        column = self.spectrogram.column(0 if self.constant else index)
+        self.buffer.push(self.bin_plan.reduce(column))
+
+    def update_to_frame(self, index):
+        """Scrolls the waterfall so its newest column is STFT frame `index`, then blits."""
+        if self.bg_cache is None or self.spectrogram is None:
+            return
+
+        # 1. Write only the columns that are new since the last update; frames skipped
+        # by the animation are filled in, so the history has no gaps. After a seek
+        # backwards or a long jump, rebuild the visible history instead.
+        if (
+            self.last_index is None
+            or index < self.last_index
+            or index - self.last_index > HISTORY_COLUMNS
+        ):
+            self.buffer.clear()
+            first = max(index - HISTORY_COLUMNS + 1, 0)
+        else:
+            first = self.last_index + 1
+        for frame in range(first, index + 1):
+            self._push_frame(frame)
+        self.last_index = index
+
+        # 2. Blit the image over the cached background
+        self.canvas.restore_region(self.bg_cache)
+        self.image.set_data(self.buffer.image())
+        self.ax.draw_artist(self.image)
+        self.canvas.blit(self.ax.bbox)
@@ -185,6 +185,12 @@ class FileSelectionPage(ctk.CTkFrame):
                 self.process_button.configure(state="normal")
                 self.process_button.configure(fg_color=COLOR_BUTTON)
 
+    def on_processing_progress(self, fraction):
+        self.process_button.configure(text=f"Processing... {fraction:.0%}")
+
+    def on_processing_finished(self):
+        self.process_button.configure(text="Cancel Noise")
+
     def _process_files(self):
         if not self.controller.input_path or not self.controller.noise_path:
             messagebox.showerror("Error", "Files missing")
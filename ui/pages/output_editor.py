@@ -5,13 +5,36 @@ audio file.
 
 import customtkinter as ctk
 from tkinter import PhotoImage, messagebox
-import time
 import numpy as np
-import sounddevice as sd
 import os
+import time
+from core.playback import TrackPlayer
+from core.profiling import log_profile
 from ..theme import *
 from ui.pages.file_selection import FileSelectionPage
 from ui.components.spectrum_plot import SpectrumPlot
+from ui.components.frame_scheduler import FrameScheduler
+from ui.components.waterfall import WaterfallPlot
+
+# Spectrogram shown in the waterfall for each track
+WATERFALL_SOURCES = {
+    "original_audio": "original_mag_db",
+    "cleaned_audio": "cleaned_mag_db",
+    "noise_audio": "noise_mag_db",
+}
+
+# Live preview: region re-rendered around the playhead when alpha/beta change, and
+# how far ahead of the playhead the next region is rendered during playback
+PREVIEW_BEFORE_SECONDS = 0.5
+PREVIEW_SECONDS = 4.0
+PREVIEW_LEAD_SECONDS = 1.0
+
+# Labels of the export formats offered next to the save button
+SAVE_FORMATS = {
+    "16-bit PCM": "int16",
+    "24-bit PCM": "int24",
+    "32-bit float": "float32",
+}
 
 
 class OutputEditorPage(ctk.CTkFrame):
@@ -23,19 +46,30 @@ class OutputEditorPage(ctk.CTkFrame):
     def __init__(self, parent, controller):
         super().__init__(parent, fg_color=COLOR_BACKGROUND)
 
-        # Audio playback settings
-        sd.default.latency = "high"
-        sd.default.blocksize = 2048
-
         self.controller = controller
         self.animation_job = None
 
+        # One output stream for all three tracks; seeking and switching tracks do not
+        # restart the device (see core/playback.py)
+        self.player = TrackPlayer(blocksize=2048, latency="high")
+
+        # Paces the spectrum animation and records FPS/dropped frames/frame times
+        self.frame_scheduler = FrameScheduler(target_fps=30)
+        # (frame index, track, result) currently drawn, to skip redrawing the same frame
+        self.shown_frame = None
+
         # Playback State
-        self.playback_start_time = 0.0
         self.paused_time = 0.0
         self.is_playing = False
         self.current_audio_key = "cleaned_audio"
 
+        # Live preview state: (alpha, beta) heard around the playhead but not yet
+        # rendered for the whole file, their cleaned spectrogram, and the (start, end)
+        # seconds of the cleaned track rendered with them
+        self.preview_params = None
+        self.preview_display = None
+        self.preview_region = (0.0, 0.0)
+
         # --- UI Setup ---
 
         # Back Button
@@ -96,25 +130,71 @@ class OutputEditorPage(ctk.CTkFrame):
             input_grid, "Beta (Flooring Factor):", 2, "0.001", "beta_entry"
         )
 
-        ctk.CTkButton(
+        self.update_button = ctk.CTkButton(
             self.settings_frame,
             text="Update Filter",
             fg_color=COLOR_ALT_GRAPH,
             hover_color="#E02E2E",
             height=30,
             command=self.update_filter,
-        ).pack(pady=10, padx=10, fill="x")
+        )
+        self.update_button.pack(pady=10, padx=10, fill="x")
+
+        # With live preview on, alpha/beta changes only re-render the audio around the
+        # playhead; the whole file is rendered on "Apply to Whole File" or save
+        self.preview_switch = ctk.CTkSwitch(
+            self.settings_frame,
+            text="Live preview",
+            text_color=COLOR_TEXT,
+            progress_color=COLOR_BUTTON,
+        )
+        self.preview_switch.select()
+        self.preview_switch.pack(pady=(0, 5), padx=10, anchor="w")
+
+        self.apply_button = ctk.CTkButton(
+            self.settings_frame,
+            text="Apply to Whole File",
+            fg_color=COLOR_DISABLED,
+            hover_color=COLOR_BUTTON_HOVER,
+            height=30,
+            state="disabled",
+            command=self.commit_preview,
+        )
+        self.apply_button.pack(pady=(0, 10), padx=10, fill="x")
+
+        # Timing breakdown of the last run, to spot slow stages
+        self.profile_label = ctk.CTkLabel(
+            self.settings_frame,
+            text="",
+            text_color="gray",
+            font=("Arial", 10),
+            wraplength=260,
+            justify="left",
+        )
+        self.profile_label.pack(pady=(0, 10), padx=10)
 
         # Save Button
-        ctk.CTkButton(
+        self.save_button = ctk.CTkButton(
             left_panel,
             text="Save Cleaned Audio",
             font=("Arial", 14, "bold"),
             height=40,
             fg_color=COLOR_BUTTON,
             hover_color=COLOR_BUTTON_HOVER,
-            command=self.controller.save_output,
-        ).pack(pady=10, side="bottom")
+            command=self.save_output,
+        )
+        self.save_button.pack(pady=10, side="bottom")
+
+        # Sample format of the saved file
+        self.format_menu = ctk.CTkOptionMenu(
+            left_panel,
+            values=list(SAVE_FORMATS),
+            fg_color=COLOR_BUTTON,
+            button_color=COLOR_BUTTON,
+            button_hover_color=COLOR_BUTTON_HOVER,
+        )
+        self.format_menu.set("16-bit PCM")
+        self.format_menu.pack(side="bottom")
 
         # --- Right Panel: Graph ---
         self.graph_frame = ctk.CTkFrame(row_frame, fg_color=COLOR_BACKGROUND)
@@ -150,6 +230,10 @@ class OutputEditorPage(ctk.CTkFrame):
         self.seek_slider.pack(side="left", fill="x", expand=True)
         self.seek_slider.set(0)
 
+        # Scrolling spectrogram of the selected track, above the controls
+        self.waterfall = WaterfallPlot(self.graph_frame)
+        self.waterfall.pack(side="bottom", fill="x")
+
     def create_setting_input(self, parent, label, row, default, attr_name):
         ctk.CTkLabel(parent, text=label, text_color=COLOR_TEXT).grid(
             row=row, column=0, padx=5, pady=2
@@ -159,6 +243,7 @@ class OutputEditorPage(ctk.CTkFrame):
         )
         entry.insert(0, default)
         entry.grid(row=row, column=1, padx=5, pady=2)
+        entry.bind("<Return>", lambda event: self.update_filter())
         setattr(self, attr_name, entry)
 
     def create_player_row(self, parent, title, key):
@@ -197,14 +282,54 @@ class OutputEditorPage(ctk.CTkFrame):
                 border_color=COLOR_BUTTON if k == key else COLOR_CARD_BACKGROUND
             )
 
+        # Takes effect at the next audio block, at the same position
+        self.player.select(key)
+        if self.is_playing:
+            self.paused_time = self.player.playback_time()
+
+        # The noise profile is a single averaged frame, repeated over time
+        res = self.controller.processing_results
+        if res:
+            self.waterfall.set_source(
+                self.display_spectrogram(WATERFALL_SOURCES[key]),
+                constant=key == "noise_audio",
+            )
         self.update_graph_to_time(self.paused_time)
 
-        if self.is_playing:
-            sd.stop()
-            self.start_playback_stream()
+    def display_spectrogram(self, name):
+        # While previewing, the cleaned spectrum follows the previewed parameters
+        if name == "cleaned_mag_db" and self.preview_display is not None:
+            return self.preview_display
+        return self.controller.processing_results[name]
+
+    def save_output(self):
+        sample_format = SAVE_FORMATS[self.format_menu.get()]
+        if self.preview_params is not None:
+            # The previewed parameters have only been applied around the playhead, so
+            # render the whole file first
+            self.commit_preview(then=lambda: self.controller.save_output(sample_format))
+        else:
+            self.controller.save_output(sample_format)
+
+    def on_save_progress(self, fraction):
+        self.save_button.configure(text=f"Saving... {fraction:.0%}", state="disabled")
+
+    def on_save_finished(self):
+        self.save_button.configure(text="Save Cleaned Audio", state="normal")
+
+    def on_processing_progress(self, fraction):
+        # Stays clickable: a new click replaces the running update
+        self.update_button.configure(text=f"Updating... {fraction:.0%}")
+
+    def on_processing_finished(self):
+        self.update_button.configure(text="Update Filter")
 
     def go_back(self):
         self.stop_playback()
+        # An update still running would bring this page back when it finishes
+        self.controller.cancel_processing()
+        # Release the audio device while no results are shown
+        self.player.close()
         self.controller.unbind("<space>")
         self.controller.show_page("FileSelectionPage")  # Pass string name
 
@@ -215,16 +340,115 @@ class OutputEditorPage(ctk.CTkFrame):
             beta = float(self.beta_entry.get())
             if M <= 0:
                 raise ValueError
-            self.stop_playback()
-            self.controller.run_processing(M, alpha, beta)
         except ValueError:
             messagebox.showerror("Error", "Invalid Input")
+            return
+
+        if self.can_preview(M):
+            self.preview_filter(alpha, beta)
+            return
+
+        # The full render replaces the previewed audio, possibly with another M
+        self.stop_playback()
+        self.clear_preview()
+        self.controller.run_processing(M, alpha, beta)
+
+    def can_preview(self, M):
+        # A new M needs a new STFT, and a running job may be replacing the analysis, so
+        # only alpha/beta changes on settled results with a cached analysis are previewed
+        controller = self.controller
+        return bool(
+            self.preview_switch.get()
+            and controller.processing_results
+            and M == controller.current_parameters.get("M")
+            and not controller.scheduler.busy
+            and controller.get_processor().has_analysis(
+                controller.input_path, controller.noise_path, M
+            )
+        )
+
+    def preview_filter(self, alpha, beta):
+        """Applies alpha/beta to the audio around the playhead; playback continues."""
+        self.preview_params = (alpha, beta)
+        self.apply_button.configure(state="normal", fg_color=COLOR_BUTTON)
+
+        now = self.player.playback_time() if self.is_playing else self.paused_time
+        preview = self.render_preview(
+            now - PREVIEW_BEFORE_SECONDS, now + PREVIEW_SECONDS
+        )
+
+        # Show the previewed spectrum; the cached frame is stale now
+        self.preview_display = preview["cleaned_mag_db"]
+        self.shown_frame = None
+        self.select_audio(self.current_audio_key)
+
+    def render_preview(self, start, end):
+        """Re-renders the cleaned track from start to end (seconds) with preview_params."""
+        controller = self.controller
+        alpha, beta = self.preview_params
+        begin = time.perf_counter()
+        preview = controller.get_processor().preview(
+            controller.input_path,
+            controller.noise_path,
+            controller.current_parameters["M"],
+            alpha,
+            beta,
+            start,
+            end,
+        )
+        self.player.splice(
+            "cleaned_audio", preview["start_sample"], preview["cleaned_audio"]
+        )
+
+        rate = controller.processing_results["sample_rate"]
+        first = preview["start_sample"] / rate
+        self.preview_region = (first, first + preview["cleaned_audio"].shape[-1] / rate)
+        log_profile(
+            {
+                "total_s": time.perf_counter() - begin,
+                "start_s": first,
+                "alpha": alpha,
+                "beta": beta,
+            },
+            label="preview",
+        )
+        return preview
+
+    def extend_preview(self, t):
+        """Keeps the previewed region ahead of time t (seconds), e.g. the playhead."""
+        # A running job may be replacing the analysis the preview is rendered from
+        if self.preview_params is None or self.controller.scheduler.busy:
+            return
+        start, end = self.preview_region
+        if not start <= t < end - PREVIEW_LEAD_SECONDS:
+            self.render_preview(t - PREVIEW_BEFORE_SECONDS, t + PREVIEW_SECONDS)
+
+    def commit_preview(self, then=None):
+        """Renders the whole file with the previewed parameters."""
+        if self.preview_params is None:
+            return
+        alpha, beta = self.preview_params
+        self.stop_playback()
+        self.clear_preview()
+        self.controller.run_processing(
+            self.controller.current_parameters["M"], alpha, beta, then=then
+        )
+
+    def clear_preview(self):
+        """Ends the preview, e.g. when a full render is submitted."""
+        self.preview_params = None
+        self.preview_display = None
+        self.preview_region = (0.0, 0.0)
+        self.apply_button.configure(state="disabled", fg_color=COLOR_DISABLED)
 
     def on_show(self):
         self.stop_playback()
         self.seek_slider.set(0)
         self.controller.bind("<space>", lambda event: self.toggle_playback())
 
+        # New results are rendered for the whole file, so any preview is over
+        self.clear_preview()
+
         res = self.controller.processing_results
         if not res:
             return
@@ -248,39 +472,54 @@ class OutputEditorPage(ctk.CTkFrame):
             text=os.path.basename(self.controller.noise_path)
         )
         self.name_labels["cleaned_audio"].configure(text="Cleaned Output.wav")
+        self.profile_label.configure(
+            text=getattr(self.controller, "profile_summary", "")
+        )
+
+        # Hand the new audio to the player; it is converted to float32 once here
+        self.player.set_tracks(
+            {
+                key: res[key]
+                for key in ("original_audio", "noise_audio", "cleaned_audio")
+            },
+            res["sample_rate"],
+        )
 
         # Init Graph Component
         self.spectrum_plot.init_plot(res["stft_freq"])
+        times = res["stft_time"]
+        frame_step = times[1] - times[0] if len(times) > 1 else 0.0
+        self.waterfall.init_plot(res["stft_freq"], frame_step)
         self.select_audio("cleaned_audio")
 
     def toggle_playback(self, event=None):
         if self.is_playing:
-            self.paused_time += time.time() - self.playback_start_time
+            self.paused_time = self.player.playback_time()
             self.stop_playback(reset=False)
         else:
             self.start_playback_stream()
             self.is_playing = True
             self.play_pause_btn.configure(image=self.pause_icon)
+            self.frame_scheduler.reset()
             self.update_animation()
 
     def start_playback_stream(self):
-        res = self.controller.processing_results
-        rate = res["sample_rate"]
-        data = res[self.current_audio_key]
-        start = int(self.paused_time * rate)
-
-        if start >= len(data):
+        # Start over when resuming from the end of the track
+        if self.paused_time >= self.player.duration:
             self.paused_time = 0
-            start = 0
 
-        sd.play(np.ascontiguousarray(data[start:]), rate)
-        self.playback_start_time = time.time()
+        self.player.seek(self.paused_time)
+        self.player.play()
 
     def stop_playback(self, reset=True):
-        sd.stop()
+        if self.is_playing:
+            # One structured log line per playback with the animation's jank metrics
+            log_profile(self.frame_scheduler.stats(), label="animation")
+        self.player.pause()
         self.is_playing = False
         if reset:
             self.paused_time = 0
+            self.player.seek(0)
             self.seek_slider.set(0)
         self.play_pause_btn.configure(image=self.play_icon)
         if self.animation_job:
@@ -294,9 +533,9 @@ class OutputEditorPage(ctk.CTkFrame):
         duration = len(res[self.current_audio_key]) / res["sample_rate"]
         self.paused_time = value * duration
         self.update_graph_to_time(self.paused_time)
-        if self.is_playing:
-            sd.stop()
-            self.start_playback_stream()
+        # Takes effect at the next audio block, playing or not
+        self.player.seek(self.paused_time)
+        self.extend_preview(self.paused_time)
 
     def update_graph_to_time(self, t):
         res = self.controller.processing_results
@@ -308,6 +547,12 @@ class OutputEditorPage(ctk.CTkFrame):
         if idx >= len(res["stft_time"]):
             idx = len(res["stft_time"]) - 1
 
+        # Nothing to redraw if this frame is already on screen
+        shown = (idx, self.current_audio_key, id(res), id(self.preview_display))
+        if shown == self.shown_frame:
+            return
+        self.shown_frame = shown
+
         # Determine which lines to show based on selected audio
         if self.current_audio_key == "original_audio":
             visible_lines = ["original"]
@@ -319,24 +564,43 @@ class OutputEditorPage(ctk.CTkFrame):
 
         # Update Component
         self.spectrum_plot.update_db(
-            res["original_mag_db"][:, idx],
-            res["cleaned_mag_db"][:, idx],
-            res["noise_mag_db"][:, 0],  # Noise profile is constant (average)
+            res["original_mag_db"].column(idx),
+            self.display_spectrogram("cleaned_mag_db").column(idx),
+            res["noise_mag_db"].column(0),  # Noise profile is constant (average)
             visible_lines=visible_lines,
         )
+        self.waterfall.update_to_frame(idx)
+
+    def on_frame_presented(self):
+        self.frame_scheduler.pending = False
 
     def update_animation(self):
         if not self.is_playing:
             return
 
         res = self.controller.processing_results
-        elapsed = self.paused_time + (time.time() - self.playback_start_time)
+        # Driven by the audio clock, so the plot shows what is heard right now and any
+        # frames in between are simply skipped
+        elapsed = self.player.playback_time()
         duration = len(res[self.current_audio_key]) / res["sample_rate"]
 
-        if elapsed < duration:
-            self.update_graph_to_time(elapsed)
-            self.seek_slider.set(elapsed / duration)
-            self.animation_job = self.after(30, self.update_animation)
+        if elapsed < duration and self.player.playing:
+            # Render the preview ahead of the playhead before playback reaches its end
+            self.extend_preview(elapsed)
+
+            # Render only once the previous frame has reached the screen
+            if self.frame_scheduler.tick():
+                with self.frame_scheduler.frame():
+                    self.update_graph_to_time(elapsed)
+                    self.seek_slider.set(elapsed / duration)
+                self.frame_scheduler.pending = True
+                self.after_idle(self.on_frame_presented)
+
+            # The delay grows when rendering is slow, so the main thread (and the GIL
+            # the audio callback needs) is never saturated
+            self.animation_job = self.after(
+                self.frame_scheduler.next_delay_ms(), self.update_animation
+            )
         else:
             self.stop_playback()
             self.update_graph_to_time(duration)